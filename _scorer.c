@@ -0,0 +1,100 @@
+/*
+ * Cosine scoring kernel for the Pinecone emulator.
+ *
+ * Rows and query are L2-normalized by the emulator, so the score of each row is
+ * a plain dot product. For small dimensions this loop beats a BLAS gemv call,
+ * whose fixed per-call overhead dominates below ~128 dims.
+ *
+ * Build: gcc -O3 -ffast-math -fPIC -shared _scorer.c -o _scorer.so
+ * The AVX2/FMA path is selected at runtime, so the library also loads on older CPUs.
+ */
+
+#include <stddef.h>
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <immintrin.h>
+#define SCORER_X86 1
+#elif defined(__ARM_NEON)
+#include <arm_neon.h>
+#endif
+
+static void score_scalar(const float *restrict M, const float *restrict q,
+                         float *restrict out, int n, int d)
+{
+    for (int i = 0; i < n; i++) {
+        const float *row = M + (size_t)i * d;
+        float acc = 0.0f;
+#pragma GCC ivdep
+        for (int j = 0; j < d; j++)
+            acc += row[j] * q[j];
+        out[i] = acc;
+    }
+}
+
+#ifdef SCORER_X86
+__attribute__((target("avx2,fma")))
+static void score_avx2(const float *restrict M, const float *restrict q,
+                       float *restrict out, int n, int d)
+{
+    for (int i = 0; i < n; i++) {
+        const float *row = M + (size_t)i * d;
+        /* Independent accumulators hide the FMA latency */
+        __m256 acc0 = _mm256_setzero_ps();
+        __m256 acc1 = _mm256_setzero_ps();
+        __m256 acc2 = _mm256_setzero_ps();
+        __m256 acc3 = _mm256_setzero_ps();
+        int j = 0;
+        for (; j + 32 <= d; j += 32) {
+            acc0 = _mm256_fmadd_ps(_mm256_loadu_ps(row + j), _mm256_loadu_ps(q + j), acc0);
+            acc1 = _mm256_fmadd_ps(_mm256_loadu_ps(row + j + 8), _mm256_loadu_ps(q + j + 8), acc1);
+            acc2 = _mm256_fmadd_ps(_mm256_loadu_ps(row + j + 16), _mm256_loadu_ps(q + j + 16), acc2);
+            acc3 = _mm256_fmadd_ps(_mm256_loadu_ps(row + j + 24), _mm256_loadu_ps(q + j + 24), acc3);
+        }
+        for (; j + 8 <= d; j += 8)
+            acc0 = _mm256_fmadd_ps(_mm256_loadu_ps(row + j), _mm256_loadu_ps(q + j), acc0);
+
+        __m256 acc = _mm256_add_ps(_mm256_add_ps(acc0, acc1), _mm256_add_ps(acc2, acc3));
+        __m128 sum = _mm_add_ps(_mm256_castps256_ps128(acc), _mm256_extractf128_ps(acc, 1));
+        sum = _mm_hadd_ps(sum, sum);
+        sum = _mm_hadd_ps(sum, sum);
+        float total = _mm_cvtss_f32(sum);
+        for (; j < d; j++)
+            total += row[j] * q[j];
+        out[i] = total;
+    }
+}
+#elif defined(__ARM_NEON)
+static void score_neon(const float *restrict M, const float *restrict q,
+                       float *restrict out, int n, int d)
+{
+    for (int i = 0; i < n; i++) {
+        const float *row = M + (size_t)i * d;
+        float32x4_t acc0 = vdupq_n_f32(0.0f);
+        float32x4_t acc1 = vdupq_n_f32(0.0f);
+        int j = 0;
+        for (; j + 8 <= d; j += 8) {
+            acc0 = vfmaq_f32(acc0, vld1q_f32(row + j), vld1q_f32(q + j));
+            acc1 = vfmaq_f32(acc1, vld1q_f32(row + j + 4), vld1q_f32(q + j + 4));
+        }
+        float total = vaddvq_f32(vaddq_f32(acc0, acc1));
+        for (; j < d; j++)
+            total += row[j] * q[j];
+        out[i] = total;
+    }
+}
+#endif
+
+/* out[i] = dot(M[i, :], q) for a row-major (n, d) float32 matrix */
+void score_cosine_f32(const float *M, const float *q, float *out, int n, int d)
+{
+#ifdef SCORER_X86
+    if (__builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma")) {
+        score_avx2(M, q, out, n, d);
+        return;
+    }
+#elif defined(__ARM_NEON)
+    score_neon(M, q, out, n, d);
+    return;
+#endif
+    score_scalar(M, q, out, n, d);
+}
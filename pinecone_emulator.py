@@ -4,23 +4,95 @@ Simple Pinecone vector database emulator.
 Provides a mock implementation of the Pinecone API for development and testing.
 """
 
+import os
+import json
+import asyncio
+import ctypes
+import mmap
+import shutil
+import threading
 import numpy as np
-from typing import Dict, List, Optional, Any, Union
-from fastapi import FastAPI, HTTPException
+from typing import Dict, List, Optional, Any, Set, Union, Literal
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 import uuid
-from sklearn.metrics.pairwise import cosine_similarity
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, unquote
 
-app = FastAPI(title="Pinecone Emulator")
+# orjson serializes responses, including NumPy value arrays, without per-float Python calls
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# SimSIMD provides AVX2/AVX-512/NEON distance kernels; fall back to NumPy/BLAS without it
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# hnswlib enables graph-based approximate search on large namespaces
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+# Numba JIT kernel for exhaustive cosine scoring, enabled with EMULATOR_NUMBA=1
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+USE_NUMBA_KERNEL = njit is not None and os.getenv("EMULATOR_NUMBA", "0") == "1"
+
+if USE_NUMBA_KERNEL:
+    # The explicit signature compiles eagerly at import, so startup pays the JIT cost
+    @njit("f4[:](f4[:, ::1], f4[::1], b1[::1])", parallel=True, fastmath=True, cache=True)
+    def _score_cosine(matrix, query_vector, mask):
+        n, d = matrix.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            if not mask[i]:
+                out[i] = -np.inf
+                continue
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query_vector[j]
+            out[i] = acc
+        return out
+
+# Hand-written C kernel for small dimensions, built from _scorer.c in the emulator image
+try:
+    _scorer = np.ctypeslib.load_library("_scorer", os.path.dirname(os.path.abspath(__file__)))
+    _scorer.score_cosine_f32.argtypes = [
+        np.ctypeslib.ndpointer(np.float32, ndim=2, flags="C_CONTIGUOUS"),
+        np.ctypeslib.ndpointer(np.float32, ndim=1, flags="C_CONTIGUOUS"),
+        np.ctypeslib.ndpointer(np.float32, ndim=1, flags=("C_CONTIGUOUS", "WRITEABLE")),
+        ctypes.c_int,
+        ctypes.c_int
+    ]
+    _scorer.score_cosine_f32.restype = None
+except OSError:
+    _scorer = None
+
+ResponseClass = ORJSONResponse if orjson is not None else JSONResponse
+
+app = FastAPI(title="Pinecone Emulator", default_response_class=ResponseClass)
 
 # Data models
 class CreateIndexRequest(BaseModel):
     name: str
     dimension: int
-    metric: str = "cosine"
+    metric: Literal["cosine", "euclidean", "dotproduct"] = "cosine"
     pods: int = 1
     replicas: int = 1
     metadata_config: Optional[Dict[str, Any]] = None
+    quantization: Optional[Literal["sq8", "binary"]] = None
+    # HNSW graph parameters, used when hnswlib is installed
+    m: int = 16
+    ef_construction: int = 200
+    ef_search: int = 50
 
 class UpsertRequest(BaseModel):
     vectors: List[Dict[str, Any]]
@@ -39,6 +111,14 @@ class QueryRequest(BaseModel):
     include_values: bool = False
     filter: Optional[Dict[str, Any]] = None
 
+class BatchQueryRequest(BaseModel):
+    vectors: List[List[float]]
+    namespace: Optional[str] = "default"
+    top_k: int = 10
+    include_metadata: bool = True
+    include_values: bool = False
+    filter: Optional[Dict[str, Any]] = None
+
 class Match(BaseModel):
     id: str
     score: float
@@ -49,10 +129,583 @@ class QueryResponse(BaseModel):
     matches: List[Match]
     namespace: str
 
+class BatchQueryResponse(BaseModel):
+    results: List[QueryResponse]
+
+class DeleteRequest(BaseModel):
+    ids: Optional[List[str]] = None
+    namespace: Optional[str] = "default"
+    delete_all: bool = False
+
+# Candidates fetched per requested match before rescoring quantized results in fp32
+SQ8_RESCORE_MULTIPLIER = 2
+# Sign bits are much coarser than int8 codes, so binary indexes rescore a wider candidate set
+BINARY_RESCORE_MULTIPLIER = 4
+# Namespaces smaller than this are always scanned exhaustively
+HNSW_MIN_VECTORS = 1000
+# Filters keeping less than this fraction of rows degrade graph recall, so scan instead
+HNSW_MIN_FILTER_FRACTION = 0.1
+# hnswlib space used for each index metric
+HNSW_SPACES = {"cosine": "cosine", "dotproduct": "ip", "euclidean": "l2"}
+# Below this dimension the C kernel beats a BLAS gemv call, whose fixed overhead dominates
+SMALL_DIM_KERNEL_MAX = 128
+# Exhaustive scans over larger matrices are split across a thread pool
+SHARDED_SCAN_MIN_BYTES = 8 * 1024 * 1024
+SCAN_WORKERS = int(os.getenv("EMULATOR_SCAN_WORKERS", os.cpu_count() or 1))
+# Rows are scored in blocks of about this many bytes so each block stays in L2
+SCAN_BLOCK_BYTES = 256 * 1024
+# When set, namespaces are backed by memory-mapped files under this directory and reloaded on startup
+DATA_DIR = os.getenv("EMULATOR_DATA_DIR")
+# Writes append id/metadata changes to a log; it is folded into the sidecar once it holds
+# more entries than the namespace has rows (and at least this many), so each write is O(1) amortized
+SIDECAR_COMPACT_MIN_ENTRIES = 1024
+
+def _map_file(path: str, dtype, shape) -> np.ndarray:
+    """Memory-map `path` as an array of `shape`, extending the file if it is too small."""
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, "a+b") as f:
+        if os.fstat(f.fileno()).st_size < nbytes:
+            f.truncate(nbytes)
+        mapping = mmap.mmap(f.fileno(), nbytes)
+    # Scoring reads whole rows but graph walks hop around, so skip kernel readahead
+    if hasattr(mmap, "MADV_RANDOM"):
+        mapping.madvise(mmap.MADV_RANDOM)
+    return np.ndarray(shape, dtype=dtype, buffer=mapping)
+
+def _flush(array: np.ndarray):
+    """Write the dirty pages of an array from _map_file back to its file."""
+    if isinstance(array.base, mmap.mmap):
+        array.base.flush()
+
+def _quantize_sq8(values: np.ndarray):
+    """Symmetric int8 quantization of a vector (or each row of a batch) after L2 normalization."""
+    norm = np.linalg.norm(values, axis=-1, keepdims=True)
+    unit = values / np.where(norm > 0, norm, 1)
+    max_abs = np.abs(unit).max(axis=-1, keepdims=True)
+    scale = np.where(max_abs > 0, max_abs / 127, 1.0)
+    return np.round(unit / scale).astype(np.int8), scale[..., 0]
+
+# Set bits per byte value, for Hamming distances without SimSIMD
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _quantize_binary(values: np.ndarray) -> np.ndarray:
+    """Pack the sign bit of each dimension, 8 dimensions per byte."""
+    return np.packbits(values > 0, axis=-1)
+
+class Namespace:
+    """
+    Struct-of-arrays storage for the vectors of one index namespace.
+    Rows live in a contiguous float32 matrix with parallel id and metadata lists,
+    plus one object column per metadata key so filters compile to array comparisons.
+    Rows are L2-normalized on write, with the original norms kept alongside,
+    so cosine scoring is a plain dot product.
+    With a `path`, the matrix and norms are memory-mapped files and ids/metadata
+    go to a JSON sidecar plus an append-only change log, both written by `persist()`.
+    """
+    
+    def __init__(self, dimension: int, capacity: int = 64, quantization: Optional[str] = None,
+                 hnsw_config: Optional[Dict[str, int]] = None, path: Optional[str] = None,
+                 metric: str = "cosine"):
+        self.dimension = dimension
+        self.metric = metric
+        self.path = path
+        self.matrix = self._allocate("f32", (capacity, dimension))
+        self.norms = self._allocate("norms", (capacity,))
+        # Optional int8 codes and per-row scales for a cheaper first scoring pass
+        self.codes = np.empty((capacity, dimension), dtype=np.int8) if quantization == "sq8" else None
+        self.scales = np.empty(capacity, dtype=np.float32) if quantization == "sq8" else None
+        # Optional packed sign bits, 32x smaller than the fp32 rows
+        self.bits = np.empty((capacity, (dimension + 7) // 8), dtype=np.uint8) if quantization == "binary" else None
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        # Columnar copy of the metadata; rows without a key hold None, like dict.get
+        self.metadata_cols: Dict[str, np.ndarray] = {}
+        self.id_to_row: Dict[str, int] = {}
+        self.n = 0
+        # HNSW graph over the rows, labelled by row number; built on the first graph search,
+        # then brought up to date from the rows written since the previous one
+        self.hnsw_config = hnsw_config or {"m": 16, "ef_construction": 200, "ef_search": 50}
+        self._graph = None
+        self._graph_rows = 0  # labels [0, _graph_rows) are live in the graph
+        self._graph_dirty: Set[int] = set()
+        # Writes and searches run in the threadpool side by side; each holds the lock, since a
+        # swap-delete moves rows and shrinks n under a scan that isn't excluded
+        self._lock = threading.Lock()
+        # Id/metadata changes not yet appended to the log, as ["u", id, metadata] or ["d", id];
+        # the sidecar names the generation of the log that continues it
+        self._pending_log: List[list] = []
+        self._log_entries = 0
+        self._log_generation = 0
+        self._sidecar_written = False
+    
+    @classmethod
+    def load(cls, path: str, dimension: int, quantization: Optional[str] = None,
+             hnsw_config: Optional[Dict[str, int]] = None, metric: str = "cosine") -> "Namespace":
+        """Re-map a persisted namespace and rebuild its in-memory side structures."""
+        with open(f"{path}.meta.json") as f:
+            sidecar = json.load(f)
+        capacity = max(os.path.getsize(f"{path}.f32") // (4 * dimension), 1)
+        store = cls(dimension, capacity, quantization, hnsw_config, path, metric)
+        store.ids = sidecar["ids"]
+        store.metadata = sidecar["metadata"]
+        store.id_to_row = {vector_id: row for row, vector_id in enumerate(store.ids)}
+        store._log_generation = sidecar.get("log_generation", 0)
+        store._sidecar_written = True
+        if os.path.exists(store._log_path()):
+            with open(store._log_path()) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A write interrupted mid-line; the entries before it are complete
+                        break
+                    store._replay(entry)
+                    store._log_entries += 1
+        store.n = len(store.ids)
+        for row, metadata in enumerate(store.metadata):
+            store._set_metadata_row(row, metadata)
+        if store.codes is not None and store.n:
+            store.codes[:store.n], store.scales[:store.n] = _quantize_sq8(store.matrix[:store.n])
+        if store.bits is not None:
+            store.bits[:store.n] = _quantize_binary(store.matrix[:store.n])
+        return store
+    
+    def _allocate(self, suffix: str, shape) -> np.ndarray:
+        """Allocate a float32 array, memory-mapped when the namespace is persistent."""
+        if self.path is None:
+            return np.empty(shape, dtype=np.float32)
+        return _map_file(f"{self.path}.{suffix}", np.float32, shape)
+    
+    def _replay(self, entry: list):
+        """Apply a logged id/metadata change, mirroring what upsert_batch and delete did to the lists."""
+        if entry[0] == "u":
+            _, vector_id, metadata = entry
+            row = self.id_to_row.get(vector_id)
+            if row is None:
+                self.id_to_row[vector_id] = len(self.ids)
+                self.ids.append(vector_id)
+                self.metadata.append(metadata)
+            else:
+                self.metadata[row] = metadata
+            return
+        row = self.id_to_row.pop(entry[1], None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            self.ids[row] = self.ids[last]
+            self.metadata[row] = self.metadata[last]
+            self.id_to_row[self.ids[row]] = row
+        self.ids.pop()
+        self.metadata.pop()
+    
+    def _log_path(self, generation: Optional[int] = None) -> str:
+        return f"{self.path}.{self._log_generation if generation is None else generation}.log"
+    
+    def persist(self):
+        """Flush the mapped arrays, then append the pending id/metadata changes to the log."""
+        if self.path is None:
+            return
+        with self._lock:
+            _flush(self.matrix)
+            _flush(self.norms)
+            pending, self._pending_log = self._pending_log, []
+            if (not self._sidecar_written
+                    or self._log_entries + len(pending) > max(self.n, SIDECAR_COMPACT_MIN_ENTRIES)):
+                self._write_sidecar()
+                return
+            with open(self._log_path(), "a") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in pending)
+            self._log_entries += len(pending)
+    
+    def _write_sidecar(self):
+        """
+        Snapshot ids/metadata into the sidecar and start an empty log generation.
+        The sidecar is swapped in atomically, so a crash leaves either the old snapshot
+        with its log or the new one with an empty log.
+        """
+        generation = self._log_generation + 1
+        open(self._log_path(generation), "w").close()
+        with open(f"{self.path}.meta.json.tmp", "w") as f:
+            json.dump({"ids": self.ids, "metadata": self.metadata, "log_generation": generation}, f)
+        os.replace(f"{self.path}.meta.json.tmp", f"{self.path}.meta.json")
+        if os.path.exists(self._log_path()):
+            os.remove(self._log_path())
+        self._log_generation = generation
+        self._log_entries = 0
+        self._sidecar_written = True
+    
+    def remove_files(self):
+        """Delete the backing files of a persistent namespace."""
+        if self.path is None:
+            return
+        for suffix in ("f32", "norms", "meta.json", f"{self._log_generation}.log"):
+            if os.path.exists(f"{self.path}.{suffix}"):
+                os.remove(f"{self.path}.{suffix}")
+    
+    def _reserve(self, rows: int):
+        """Grow the matrix geometrically so it can hold at least `rows` rows."""
+        capacity = max(self.matrix.shape[0], 1)
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        if self.path is not None:
+            # Extending the files keeps existing rows in place, so just map them again
+            _flush(self.matrix)
+            _flush(self.norms)
+            self.matrix = self._allocate("f32", (capacity, self.dimension))
+            self.norms = self._allocate("norms", (capacity,))
+        else:
+            grown = np.empty((capacity, self.dimension), dtype=np.float32)
+            grown[:self.n] = self.matrix[:self.n]
+            self.matrix = grown
+            self.norms = np.resize(self.norms, capacity)
+        for key, column in self.metadata_cols.items():
+            grown_column = np.full(capacity, None, dtype=object)
+            grown_column[:self.n] = column[:self.n]
+            self.metadata_cols[key] = grown_column
+        if self.codes is not None:
+            grown_codes = np.empty((capacity, self.dimension), dtype=np.int8)
+            grown_codes[:self.n] = self.codes[:self.n]
+            self.codes = grown_codes
+            self.scales = np.resize(self.scales, capacity)
+        if self.bits is not None:
+            grown_bits = np.empty((capacity, self.bits.shape[1]), dtype=np.uint8)
+            grown_bits[:self.n] = self.bits[:self.n]
+            self.bits = grown_bits
+    
+    def _set_metadata_row(self, row: int, metadata: Dict[str, Any]):
+        """Write a row's metadata into the per-key columns, adding new columns as keys appear."""
+        for key, column in self.metadata_cols.items():
+            column[row] = metadata.get(key)
+        for key in metadata.keys() - self.metadata_cols.keys():
+            column = np.full(self.matrix.shape[0], None, dtype=object)
+            column[row] = metadata[key]
+            self.metadata_cols[key] = column
+    
+    def filter_mask(self, metadata_filter: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of the rows whose metadata exactly matches every filter entry."""
+        mask = np.ones(self.n, dtype=bool)
+        for key, value in metadata_filter.items():
+            column = self.metadata_cols.get(key)
+            if column is None:
+                mask &= value is None
+            elif isinstance(value, (list, tuple, dict)):
+                # Containers would broadcast against the column, so compare them one by one
+                mask &= np.fromiter((item == value for item in column[:self.n]), dtype=bool, count=self.n)
+            else:
+                mask &= np.asarray(column[:self.n] == value, dtype=bool)
+        return mask
+    
+    def upsert_batch(self, vector_ids: List[str], batch: np.ndarray, metadata: List[Dict[str, Any]]):
+        """
+        Insert or overwrite a (B, d) float32 batch in one pass.
+        New ids are appended as a block; existing ids keep their rows.
+        """
+        with self._lock:
+            self._upsert_batch(vector_ids, batch, metadata)
+    
+    def _upsert_batch(self, vector_ids: List[str], batch: np.ndarray, metadata: List[Dict[str, Any]]):
+        self._reserve(self.n + len(vector_ids))
+        rows = np.empty(len(vector_ids), dtype=np.intp)
+        for i, (vector_id, row_metadata) in enumerate(zip(vector_ids, metadata)):
+            row = self.id_to_row.get(vector_id)
+            if row is None:
+                row = self.n
+                self.n += 1
+                self.ids.append(vector_id)
+                self.metadata.append(row_metadata)
+                self.id_to_row[vector_id] = row
+            else:
+                self.metadata[row] = row_metadata
+            self._set_metadata_row(row, row_metadata)
+            rows[i] = row
+            if self.path is not None:
+                self._pending_log.append(["u", vector_id, row_metadata])
+        
+        norms = np.linalg.norm(batch, axis=1)
+        self.norms[rows] = norms
+        self.matrix[rows] = batch / np.where(norms > 0, norms, 1)[:, None]
+        if self.codes is not None:
+            self.codes[rows], self.scales[rows] = _quantize_sq8(self.matrix[rows])
+        if self.bits is not None:
+            self.bits[rows] = _quantize_binary(self.matrix[rows])
+        if self._graph is not None:
+            self._graph_dirty.update(rows.tolist())
+    
+    def delete(self, vector_id: str) -> bool:
+        """Remove a vector by moving the last row into its slot."""
+        with self._lock:
+            return self._delete(vector_id)
+    
+    def _delete(self, vector_id: str) -> bool:
+        row = self.id_to_row.pop(vector_id, None)
+        if row is None:
+            return False
+        if self.path is not None:
+            self._pending_log.append(["d", vector_id])
+        last = self.n - 1
+        if row != last:
+            moved_id = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.norms[row] = self.norms[last]
+            if self.codes is not None:
+                self.codes[row] = self.codes[last]
+                self.scales[row] = self.scales[last]
+            if self.bits is not None:
+                self.bits[row] = self.bits[last]
+            self.ids[row] = moved_id
+            self.metadata[row] = self.metadata[last]
+            for column in self.metadata_cols.values():
+                column[row] = column[last]
+            self.id_to_row[moved_id] = row
+            if self._graph is not None:
+                self._graph_dirty.add(row)
+        self.ids.pop()
+        self.metadata.pop()
+        for column in self.metadata_cols.values():
+            column[last] = None
+        self.n = last
+        return True
+    
+    def normalized(self) -> np.ndarray:
+        """Return the L2-normalized (n, d) view used for cosine scoring."""
+        return self.matrix[:self.n]
+    
+    def values(self, row: int) -> np.ndarray:
+        """Reconstruct the original values of a row from its unit vector and norm."""
+        norm = self.norms[row]
+        return self.matrix[row] * norm if norm > 0 else np.array(self.matrix[row])
+    
+    def quantized_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Approximate cosine scores computed from the int8 codes or the packed sign bits."""
+        if self.bits is not None:
+            return self.binary_scores(query_vector)
+        codes = self.codes[:self.n]
+        if simsimd is not None:
+            query_codes, _ = _quantize_sq8(query_vector)
+            distances = simsimd.cdist(query_codes[None, :], codes, metric="cosine")
+            return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+        # Widen one block of codes at a time, so the fallback never copies all n rows to float32
+        scores = np.empty(self.n, dtype=np.float32)
+        block_rows = max(SCAN_BLOCK_BYTES // (self.dimension * 4), 1)
+        for start in range(0, self.n, block_rows):
+            stop = min(start + block_rows, self.n)
+            scores[start:stop] = codes[start:stop].astype(np.float32) @ query_vector
+        return scores * self.scales[:self.n]
+    
+    def binary_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Sign agreement scores in [-1, 1], (dimension - 2 * Hamming distance) / dimension."""
+        bits = self.bits[:self.n]
+        query_bits = _quantize_binary(query_vector)
+        if simsimd is not None:
+            distances = simsimd.cdist(query_bits[None, :], bits, metric="hamming", dtype="bin8")
+            distances = np.asarray(distances, dtype=np.float32)[0]
+        else:
+            distances = _POPCOUNT[bits ^ query_bits].sum(axis=1, dtype=np.float32)
+        return (self.dimension - 2 * distances) / self.dimension
+    
+    def metric_scores(self, scores: np.ndarray, rows, query_norm: float) -> np.ndarray:
+        """
+        Convert cosine scores of `rows` into ranking scores for the index metric, higher first.
+        Dot products rescale by both norms; euclidean ranks by -||a - b||^2 = 2a.b - ||a||^2 - ||b||^2.
+        A (Q, n) batch of scores takes a (Q, 1) column of query norms.
+        """
+        if self.metric == "cosine":
+            return scores
+        norms = self.norms[rows]
+        dots = scores * norms * query_norm
+        if self.metric == "dotproduct":
+            return dots
+        return 2 * dots - norms * norms - query_norm * query_norm
+    
+    def hnsw_search(self, query_vector: np.ndarray, query_norm: float, k: int,
+                    mask: Optional[np.ndarray] = None):
+        """
+        Approximate top-k search over an HNSW graph of the rows, returning metric ranking scores.
+        Returns (None, None) when the graph walk cannot find k matching rows.
+        """
+        with self._lock:
+            return self._hnsw_search(query_vector, query_norm, k, mask)
+    
+    def _hnsw_search(self, query_vector: np.ndarray, query_norm: float, k: int,
+                     mask: Optional[np.ndarray] = None):
+        if self.metric != "cosine":
+            query_vector = query_vector * query_norm
+        row_filter = (lambda label: label < len(mask) and bool(mask[label])) if mask is not None else None
+        self._sync_graph()
+        self._graph.set_ef(max(self.hnsw_config["ef_search"], k))
+        try:
+            labels, distances = self._graph.knn_query(query_vector, k=k, filter=row_filter)
+        except RuntimeError:
+            return None, None
+        # "l2" distances are squared euclidean; "cosine" and "ip" distances are 1 - similarity
+        scores = -distances[0] if self.metric == "euclidean" else 1.0 - distances[0]
+        return labels[0].astype(np.intp), scores
+    
+    def _graph_items(self, rows: np.ndarray) -> np.ndarray:
+        """Vectors to index for `rows`; dot product and euclidean graphs use the unnormalized rows."""
+        items = self.matrix[rows]
+        if self.metric != "cosine":
+            items = items * self.norms[rows, None]
+        return items
+    
+    def _sync_graph(self):
+        """
+        Build the HNSW graph on first use, otherwise apply the writes since the last sync:
+        rows past the end are marked deleted and rewritten rows are re-added under their label.
+        Called with the lock held.
+        """
+        if self._graph is None:
+            self._graph = hnswlib.Index(space=HNSW_SPACES[self.metric], dim=self.dimension)
+            self._graph.init_index(
+                max_elements=max(self.n, 1),
+                ef_construction=self.hnsw_config["ef_construction"],
+                M=self.hnsw_config["m"]
+            )
+            rows = np.arange(self.n)
+        else:
+            for label in range(self.n, self._graph_rows):
+                self._graph.mark_deleted(label)
+            rows = np.fromiter(sorted(row for row in self._graph_dirty if row < self.n), dtype=np.intp)
+            capacity = self._graph.get_max_elements()
+            if self.n > capacity:
+                self._graph.resize_index(max(self.n, 2 * capacity))
+        if len(rows):
+            self._graph.add_items(self._graph_items(rows), rows)
+        self._graph_rows = self.n
+        self._graph_dirty.clear()
+
 # In-memory storage
 indexes = {}
 vectors = {}
 
+def _index_dir(index_name: str) -> str:
+    return os.path.join(DATA_DIR, quote(index_name, safe=""))
+
+def _namespace_path(index_name: str, namespace: str) -> Optional[str]:
+    """File prefix for a namespace's mapped arrays, or None when persistence is off."""
+    if DATA_DIR is None:
+        return None
+    return os.path.join(_index_dir(index_name), quote(namespace, safe=""))
+
+def _load_indexes():
+    """Re-map every index and namespace persisted under DATA_DIR."""
+    if DATA_DIR is None or not os.path.isdir(DATA_DIR):
+        return
+    for entry in sorted(os.listdir(DATA_DIR)):
+        info_path = os.path.join(DATA_DIR, entry, "index.json")
+        if not os.path.exists(info_path):
+            continue
+        with open(info_path) as f:
+            info = json.load(f)
+        index_name = info["name"]
+        indexes[index_name] = info
+        vectors[index_name] = {}
+        for filename in os.listdir(os.path.join(DATA_DIR, entry)):
+            if not filename.endswith(".meta.json"):
+                continue
+            namespace = unquote(filename[:-len(".meta.json")])
+            vectors[index_name][namespace] = Namespace.load(
+                _namespace_path(index_name, namespace),
+                info["dimension"],
+                quantization=info["quantization"],
+                hnsw_config=info["hnsw"],
+                metric=info["metric"]
+            )
+
+_load_indexes()
+
+def _cosine_scores(matrix: np.ndarray, query_vector: np.ndarray) -> np.ndarray:
+    """Score every row of a normalized matrix against a normalized query vector."""
+    if _scorer is not None and matrix.shape[1] < SMALL_DIM_KERNEL_MAX and matrix.flags.c_contiguous:
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        query_vector = np.ascontiguousarray(query_vector, dtype=np.float32)
+        _scorer.score_cosine_f32(matrix, query_vector, scores, matrix.shape[0], matrix.shape[1])
+        return scores
+    if simsimd is not None:
+        distances = simsimd.cdist(query_vector[None, :], matrix, metric="cosine")
+        return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+    return matrix @ query_vector
+
+def _top_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    # O(N) partition, then sort only the k winners
+    rows = np.argpartition(-scores, k - 1)[:k]
+    return rows[np.argsort(-scores[rows])]
+
+_scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS) if SCAN_WORKERS > 1 else None
+
+def _scan_shard(store: Namespace, query_vector: np.ndarray, query_norm: float,
+                mask: Optional[np.ndarray], start: int, stop: int, top_k: int):
+    """Score rows [start, stop) block by block and return the shard's local top_k."""
+    matrix = store.normalized()
+    scores = np.empty(stop - start, dtype=np.float32)
+    block_rows = max(SCAN_BLOCK_BYTES // (matrix.shape[1] * 4), 1)
+    for block_start in range(start, stop, block_rows):
+        block_stop = min(block_start + block_rows, stop)
+        scores[block_start - start:block_stop - start] = _cosine_scores(
+            matrix[block_start:block_stop], query_vector
+        )
+    scores = store.metric_scores(scores, slice(start, stop), query_norm)
+    if mask is not None:
+        scores[~mask[start:stop]] = -np.inf
+    rows = _top_rows(scores, min(top_k, len(scores)))
+    return rows + start, scores[rows]
+
+def _sharded_search(store: Namespace, query_vector: np.ndarray, query_norm: float, top_k: int,
+                    mask: Optional[np.ndarray]):
+    """Exhaustive top_k over row shards scored in parallel, merged by score."""
+    bounds = np.linspace(0, store.n, SCAN_WORKERS + 1, dtype=np.intp)
+    futures = [
+        _scan_executor.submit(_scan_shard, store, query_vector, query_norm, mask, start, stop, top_k)
+        for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+    ]
+    shard_results = [future.result() for future in futures]
+    rows = np.concatenate([shard_rows for shard_rows, _ in shard_results])
+    scores = np.concatenate([shard_scores for _, shard_scores in shard_results])
+    order = _top_rows(scores, top_k)
+    return rows[order], scores[order]
+
+def _brute_force_search(store: Namespace, query_vector: np.ndarray, query_norm: float, top_k: int,
+                        mask: Optional[np.ndarray], candidates: int):
+    """Score every row of a namespace and return the top_k rows with their ranking scores."""
+    quantized = store.codes is not None or store.bits is not None
+    if quantized:
+        # First pass over the int8 codes or sign bits; the best candidates are rescored in fp32 below
+        scores = store.quantized_scores(query_vector)
+    elif USE_NUMBA_KERNEL:
+        # The kernel masks filtered rows to -inf while scoring
+        row_mask = mask if mask is not None else np.ones(store.n, dtype=bool)
+        scores = _score_cosine(store.normalized(), query_vector, row_mask)
+        if store.metric == "cosine":
+            mask = None
+    elif _scan_executor is not None and store.n * store.dimension * 4 >= SHARDED_SCAN_MIN_BYTES:
+        # GIL-free scoring on each shard, so the scan uses every core
+        return _sharded_search(store, query_vector, query_norm, top_k, mask)
+    else:
+        scores = _cosine_scores(store.normalized(), query_vector)
+    
+    # Rows and query are unit vectors; fold the cached norms back in for other metrics
+    scores = store.metric_scores(scores, slice(0, store.n), query_norm)
+    if mask is not None:
+        scores[~mask] = -np.inf
+    
+    if quantized:
+        multiplier = SQ8_RESCORE_MULTIPLIER if store.codes is not None else BINARY_RESCORE_MULTIPLIER
+        candidate_rows = _top_rows(scores, min(top_k * multiplier, candidates))
+        rescored = store.metric_scores(
+            _cosine_scores(store.normalized()[candidate_rows], query_vector), candidate_rows, query_norm
+        )
+        order = _top_rows(rescored, top_k)
+        return candidate_rows[order], rescored[order]
+    
+    top_rows = _top_rows(scores, top_k)
+    return top_rows, scores[top_rows]
+
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
@@ -68,11 +721,22 @@ def create_index(request: CreateIndexRequest):
         "name": request.name,
         "dimension": request.dimension,
         "metric": request.metric,
+        "quantization": request.quantization,
+        "hnsw": {
+            "m": request.m,
+            "ef_construction": request.ef_construction,
+            "ef_search": request.ef_search
+        },
         "status": "ready"
     }
     
     vectors[request.name] = {}
     
+    if DATA_DIR is not None:
+        os.makedirs(_index_dir(request.name), exist_ok=True)
+        with open(os.path.join(_index_dir(request.name), "index.json"), "w") as f:
+            json.dump(indexes[request.name], f)
+    
     return {"message": f"Created index: {request.name}"}
 
 @app.get("/indexes")
@@ -88,89 +752,302 @@ def delete_index(index_name: str):
     
     del indexes[index_name]
     del vectors[index_name]
+    if DATA_DIR is not None:
+        shutil.rmtree(_index_dir(index_name), ignore_errors=True)
     
     return {"message": f"Deleted index: {index_name}"}
 
+def _get_or_create_namespace(index_name: str, namespace: str) -> Namespace:
+    """Look up a namespace for writing, creating it on first use."""
+    if index_name not in indexes:
+        raise HTTPException(status_code=404, detail=f"Index {index_name} not found")
+    
+    if namespace not in vectors[index_name]:
+        vectors[index_name][namespace] = Namespace(
+            indexes[index_name]["dimension"],
+            quantization=indexes[index_name]["quantization"],
+            hnsw_config=indexes[index_name]["hnsw"],
+            path=_namespace_path(index_name, namespace),
+            metric=indexes[index_name]["metric"]
+        )
+    return vectors[index_name][namespace]
+
+def _upsert_batch(store: Namespace, vector_ids: List[str], batch: Optional[np.ndarray],
+                  metadata: List[Dict[str, Any]]):
+    """Validate a (B, d) batch with a single shape check, then write and persist it."""
+    if batch is None or batch.ndim != 2 or batch.shape[1] != store.dimension:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Vector dimension mismatch. Expected {store.dimension}"
+        )
+    
+    store.upsert_batch(vector_ids, batch, metadata)
+    store.persist()
+
 @app.post("/vectors/upsert")
 def upsert_vectors(index_name: str, request: UpsertRequest):
     """Upsert vectors into an index."""
-    if index_name not in indexes:
-        raise HTTPException(status_code=404, detail=f"Index {index_name} not found")
+    store = _get_or_create_namespace(index_name, request.namespace or "default")
     
-    namespace = request.namespace or "default"
+    if not request.vectors:
+        return {"upserted_count": 0}
     
-    if namespace not in vectors[index_name]:
-        vectors[index_name][namespace] = {}
+    # Convert the whole batch in one call
+    try:
+        batch = np.asarray([vector.get("values", []) for vector in request.vectors], dtype=np.float32)
+    except ValueError:
+        batch = None
     
-    for vector in request.vectors:
-        vector_id = vector.get("id", str(uuid.uuid4()))
-        vector_values = vector.get("values", [])
-        metadata = vector.get("metadata", {})
-        
-        if len(vector_values) != indexes[index_name]["dimension"]:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Vector dimension mismatch. Expected {indexes[index_name]['dimension']}"
-            )
-        
-        vectors[index_name][namespace][vector_id] = {
-            "values": vector_values,
-            "metadata": metadata
-        }
+    _upsert_batch(
+        store,
+        [vector.get("id", str(uuid.uuid4())) for vector in request.vectors],
+        batch,
+        [vector.get("metadata") or {} for vector in request.vectors]
+    )
     
     return {"upserted_count": len(request.vectors)}
 
-@app.post("/query")
-def query(index_name: str, request: QueryRequest):
-    """Query vectors in an index."""
+@app.post("/vectors/upsert_raw")
+async def upsert_vectors_raw(index_name: str, request: Request, namespace: str = "default"):
+    """
+    Upsert vectors from a binary body: a little-endian uint32 header length, a JSON list
+    of {"id", "metadata"} records, then one packed little-endian float32 row per record.
+    """
+    store = _get_or_create_namespace(index_name, namespace)
+    body = await request.body()
+    
+    header_length = int.from_bytes(body[:4], "little")
+    try:
+        records = json.loads(body[4:4 + header_length])
+    except ValueError:
+        records = None
+    if len(body) < 4 or not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Malformed upsert header")
+    
+    payload = memoryview(body)[4 + header_length:]
+    if len(payload) != len(records) * store.dimension * 4:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Vector dimension mismatch. Expected {store.dimension}"
+        )
+    if not records:
+        return {"upserted_count": 0}
+    
+    # Zero-copy view of the packed rows; no per-float parsing
+    batch = np.frombuffer(payload, dtype="<f4").reshape(len(records), store.dimension)
+    await asyncio.to_thread(
+        _upsert_batch,
+        store,
+        [record.get("id", str(uuid.uuid4())) for record in records],
+        batch,
+        [record.get("metadata") or {} for record in records]
+    )
+    
+    return {"upserted_count": len(records)}
+
+@app.post("/vectors/delete")
+def delete_vectors(index_name: str, request: DeleteRequest):
+    """Delete vectors by id, or every vector in a namespace."""
     if index_name not in indexes:
         raise HTTPException(status_code=404, detail=f"Index {index_name} not found")
     
     namespace = request.namespace or "default"
     
     if namespace not in vectors[index_name]:
-        return {"matches": [], "namespace": namespace}
+        return {"deleted_count": 0}
     
-    query_vector = np.array(request.vector).reshape(1, -1)
+    if request.delete_all:
+        deleted_count = vectors[index_name][namespace].n
+        vectors[index_name][namespace].remove_files()
+        del vectors[index_name][namespace]
+        return {"deleted_count": deleted_count}
     
-    # Calculate similarities for all vectors in the namespace
-    similarities = []
-    for vector_id, vector_data in vectors[index_name][namespace].items():
-        vector_values = np.array(vector_data["values"]).reshape(1, -1)
-        
+    store = vectors[index_name][namespace]
+    deleted_count = sum(store.delete(vector_id) for vector_id in request.ids or [])
+    store.persist()
+    
+    return {"deleted_count": deleted_count}
+
+def _search(store: Namespace, query_vector: np.ndarray, top_k: int,
+            metadata_filter: Optional[Dict[str, Any]], include_values: bool,
+            include_metadata: bool) -> List[Dict[str, Any]]:
+    """Score a namespace against a query and format the top matches."""
+    # Normalize the query once; cosine then reduces to a single matrix-vector product
+    query_norm = np.sqrt(np.vdot(query_vector, query_vector))
+    if query_norm > 0:
+        query_vector = query_vector / query_norm
+    
+    # Rows, ids and metadata stay put until the scan and its matches are done
+    with store._lock:
         # Apply filter if present
-        if request.filter:
-            metadata = vector_data["metadata"]
+        mask = None
+        candidates = store.n
+        if metadata_filter:
             # Simple filter implementation (only exact matches)
-            matches_filter = all(
-                metadata.get(k) == v for k, v in request.filter.items()
-            )
-            if not matches_filter:
-                continue
+            mask = store.filter_mask(metadata_filter)
+            candidates = int(mask.sum())
         
-        similarity = cosine_similarity(query_vector, vector_values)[0][0]
-        similarities.append((vector_id, similarity, vector_data))
-    
-    # Sort by similarity and take top_k
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    top_matches = similarities[:request.top_k]
+        top_k = min(top_k, candidates)
+        if top_k <= 0:
+            return []
+        
+        # Walk the HNSW graph on large namespaces, otherwise scan every row
+        top_rows = None
+        if (hnswlib is not None and store.n >= HNSW_MIN_VECTORS
+                and candidates >= store.n * HNSW_MIN_FILTER_FRACTION):
+            top_rows, top_scores = store._hnsw_search(query_vector, query_norm, top_k, mask)
+        if top_rows is None:
+            top_rows, top_scores = _brute_force_search(store, query_vector, query_norm, top_k, mask, candidates)
+        
+        return _format_matches(store, top_rows, top_scores, include_values, include_metadata)
+
+def _format_matches(store: Namespace, top_rows: np.ndarray, top_scores: np.ndarray,
+                    include_values: bool, include_metadata: bool) -> List[Dict[str, Any]]:
+    """Build match dicts in the QueryResponse shape; orjson writes value arrays directly."""
+    if store.metric == "euclidean":
+        # Ranking used negated squared distances; report the distances themselves
+        top_scores = -top_scores
     
-    # Format response
     matches = []
-    for vector_id, score, vector_data in top_matches:
+    for row, score in zip(top_rows, top_scores):
         match = {
-            "id": vector_id,
+            "id": store.ids[row],
             "score": float(score),
-            "metadata": vector_data["metadata"] if request.include_metadata else None
+            "values": None,
+            "metadata": store.metadata[row] if include_metadata else None
         }
         
-        if request.include_values:
-            match["values"] = vector_data["values"]
+        if include_values:
+            values = store.values(row)
+            match["values"] = values if orjson is not None else values.tolist()
             
-        matches.append(Match(**match))
+        matches.append(match)
+    
+    return matches
+
+async def _run_query(index_name: str, namespace: str, query_vector: np.ndarray, top_k: int,
+                     metadata_filter: Optional[Dict[str, Any]], include_values: bool,
+                     include_metadata: bool):
+    """Shared body of the JSON and binary query endpoints."""
+    if index_name not in indexes:
+        raise HTTPException(status_code=404, detail=f"Index {index_name} not found")
+    
+    if namespace not in vectors[index_name]:
+        return {"matches": [], "namespace": namespace}
+    
+    store = vectors[index_name][namespace]
+    if store.n == 0:
+        return {"matches": [], "namespace": namespace}
+    
+    if query_vector.shape[0] != store.dimension:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Vector dimension mismatch. Expected {store.dimension}"
+        )
+    
+    # BLAS, SimSIMD and hnswlib drop the GIL, so queries on different namespaces score on
+    # separate cores while the event loop keeps serving requests
+    matches = await asyncio.to_thread(
+        _search, store, query_vector, top_k, metadata_filter, include_values, include_metadata
+    )
+    
+    return ResponseClass({"matches": matches, "namespace": namespace})
+
+@app.post("/query", response_model=QueryResponse)
+async def query(index_name: str, request: QueryRequest):
+    """Query vectors in an index."""
+    return await _run_query(
+        index_name,
+        request.namespace or "default",
+        np.ascontiguousarray(request.vector, dtype=np.float32),
+        request.top_k,
+        request.filter,
+        request.include_values,
+        request.include_metadata
+    )
+
+def _search_batch(store: Namespace, query_matrix: np.ndarray, request: BatchQueryRequest) -> List[List[Dict[str, Any]]]:
+    """Exact top-k for every row of a (Q, d) query matrix from a single SGEMM."""
+    query_norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+    query_matrix = query_matrix / np.where(query_norms > 0, query_norms, 1)
+    
+    # Rows, ids and metadata stay put until the scan and its matches are done
+    with store._lock:
+        candidates = store.n
+        mask = None
+        if request.filter:
+            mask = store.filter_mask(request.filter)
+            candidates = int(mask.sum())
+        top_k = min(request.top_k, candidates)
+        if top_k <= 0:
+            return [[] for _ in range(len(query_matrix))]
+        
+        # One (Q, d) x (d, n) product streams the matrix once for the whole batch
+        scores = store.metric_scores(query_matrix @ store.normalized().T, slice(0, store.n), query_norms)
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+        
+        results = []
+        for query_scores in scores:
+            top_rows = _top_rows(query_scores, top_k)
+            results.append(_format_matches(
+                store, top_rows, query_scores[top_rows], request.include_values, request.include_metadata
+            ))
+        return results
+
+@app.post("/query_batch", response_model=BatchQueryResponse)
+async def query_batch(index_name: str, request: BatchQueryRequest):
+    """Query an index with several vectors at once; returns one QueryResponse per vector."""
+    if index_name not in indexes:
+        raise HTTPException(status_code=404, detail=f"Index {index_name} not found")
+    
+    namespace = request.namespace or "default"
+    store = vectors[index_name].get(namespace)
+    if store is None or store.n == 0 or not request.vectors:
+        return {"results": [{"matches": [], "namespace": namespace} for _ in request.vectors]}
+    
+    try:
+        query_matrix = np.asarray(request.vectors, dtype=np.float32)
+    except ValueError:
+        query_matrix = None
+    if query_matrix is None or query_matrix.ndim != 2 or query_matrix.shape[1] != store.dimension:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Vector dimension mismatch. Expected {store.dimension}"
+        )
+    
+    results = await asyncio.to_thread(_search_batch, store, query_matrix, request)
+    
+    return ResponseClass({"results": [{"matches": matches, "namespace": namespace} for matches in results]})
+
+@app.post("/query_raw", response_model=QueryResponse)
+async def query_raw(index_name: str, request: Request, namespace: str = "default",
+                    include_values: bool = False, include_metadata: bool = True,
+                    filter: Optional[str] = None):
+    """
+    Query with a binary body: a little-endian uint32 top_k followed by the query
+    vector as packed little-endian float32. `filter` is a JSON-encoded metadata filter.
+    """
+    body = await request.body()
+    if len(body) < 4 or len(body) % 4:
+        raise HTTPException(status_code=400, detail="Malformed query body")
+    
+    try:
+        metadata_filter = json.loads(filter) if filter else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed filter")
     
-    return QueryResponse(matches=matches, namespace=namespace)
+    return await _run_query(
+        index_name,
+        namespace,
+        np.frombuffer(body, dtype="<f4", offset=4),
+        int.from_bytes(body[:4], "little"),
+        metadata_filter,
+        include_values,
+        include_metadata
+    )
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080) 
\ No newline at end of file
+    # "auto" picks uvloop and httptools when they are installed, as in the emulator image
+    uvicorn.run(app, host="0.0.0.0", port=8080, loop="auto", http="auto") 
\ No newline at end of file
@@ -26,6 +26,7 @@ const App: React.FC = () => {
     const [inputValue, setInputValue] = useState('');
     const [isConnected, setIsConnected] = useState(false);
     const [isLoading, setIsLoading] = useState(false);
+    const [loadingStatus, setLoadingStatus] = useState<string | null>(null);
     const websocketRef = useRef<WebSocket | null>(null);
     const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -40,8 +41,13 @@ const App: React.FC = () => {
             };
 
             ws.onmessage = (event) => {
+                // Progress frames arrive while the agent works; only the final response ends loading
+                if (handleProgressFrame(event.data)) {
+                    return;
+                }
                 handleAgentResponse(event.data);
                 setIsLoading(false);
+                setLoadingStatus(null);
             };
 
             ws.onerror = () => {
@@ -101,6 +107,22 @@ const App: React.FC = () => {
         ]);
     };
 
+    // Show the status text of a progress frame; returns false for any other message
+    const handleProgressFrame = (data: string): boolean => {
+        try {
+            const frame = JSON.parse(data);
+            if (frame.type !== 'progress') {
+                return false;
+            }
+            if (frame.message) {
+                setLoadingStatus(frame.message);
+            }
+            return true;
+        } catch (e) {
+            return false;
+        }
+    };
+
     // Handle response from the agent
     const handleAgentResponse = (data: string) => {
         try {
@@ -193,6 +215,7 @@ const App: React.FC = () => {
                 <ChatWindow
                     messages={messages}
                     isLoading={isLoading}
+                    loadingStatus={loadingStatus}
                     messagesEndRef={messagesEndRef}
                     onQuickActionClick={handleQuickActionClick}
                     onCheckCompatibility={handleCheckCompatibility}
@@ -21,6 +21,7 @@ interface Message {
 interface ChatWindowProps {
     messages: Message[];
     isLoading: boolean;
+    loadingStatus?: string | null;
     messagesEndRef: React.RefObject<HTMLDivElement>;
     onQuickActionClick: (action: string) => void;
     onCheckCompatibility: (partNumber: string) => void;
@@ -29,6 +30,7 @@ interface ChatWindowProps {
 const ChatWindow: React.FC<ChatWindowProps> = ({
     messages,
     isLoading,
+    loadingStatus,
     messagesEndRef,
     onQuickActionClick,
     onCheckCompatibility
@@ -128,6 +130,7 @@ ${jsonObj.description ? `\n${jsonObj.description}` : ''}
                                 <span></span>
                                 <span></span>
                             </div>
+                            {loadingStatus && <div className="loading-status">{loadingStatus}</div>}
                         </div>
                     </div>
                 )}
@@ -1,8 +1,14 @@
 import os
+import re
 import json
 import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import aiohttp
+import redis
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Pattern, Set, FrozenSet, Callable, Iterator, AsyncIterator
 from dotenv import load_dotenv
 
 from langchain_core.language_models import BaseChatModel
@@ -14,6 +20,19 @@ except ImportError:
     ChatDeepseek = None
     logging.warning("Could not import DeepseekChat. LLM-based classification will be disabled.")
 
+# orjson parses tool results faster; fall back to the stdlib json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Async Redis client for the tool result cache
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+    logging.warning("Could not import redis.asyncio. Tool result caching will be disabled.")
+
 from langchain_core.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate, ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -33,12 +52,283 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Tool results are cached in Redis for this many seconds
+RESPONSE_CACHE_TTL = 900
+# The tools report failures and missing parts as ordinary strings, often caused by a Mongo or
+# Pinecone blip, so those answers expire much sooner
+RESPONSE_ERROR_TTL = 30
+# Start of the error and not-found results the tools return instead of raising
+ERROR_RESULT_PREFIXES: Tuple[str, ...] = (
+    '{"error"', "Error ", "Invalid query format", "No installation instructions found",
+    "No troubleshooting information found"
+)
+# Cart and order results depend on live state, so they are never cached
+UNCACHED_INTENTS: Set[str] = {"cart", "order"}
+
+# Patterns used by _extract_parameters, compiled once at import
+# Part numbers like "W10295370A" or "67003753"
+PART_NUMBER_PATTERN: Pattern = re.compile(r'([a-zA-Z]{0,3}\d{4,10}[a-zA-Z0-9]{0,5})')
+# Model numbers (usually alphanumeric)
+MODEL_NUMBER_PATTERN: Pattern = re.compile(r'([a-zA-Z]{2,5}\d{3,7}[a-zA-Z0-9]{0,5})')
+QUANTITY_PATTERN: Pattern = re.compile(r'(\d+)\s+(pcs|pieces|units|quantity)')
+# Order numbers (typically 6-10 digits)
+ORDER_NUMBER_PATTERN: Pattern = re.compile(r'order\s+(?:number\s+)?#?(\d{6,10})')
+EMAIL_PATTERN: Pattern = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
+# Part names recognised in queries, in priority order
+PART_NAMES: List[str] = [
+    "water filter", "ice maker", "control board", "heating element", "drain pump", "door gasket"
+]
+
+# Problem phrases for diagnose queries, in priority order
+DIAGNOSE_PROBLEMS: List[str] = [
+    "not cooling", "no water", "leaking", "not draining",
+    "making noise", "not working", "ice maker", "no ice",
+    "water dispenser", "not running", "door", "light", "strange taste"
+]
+
+# Phrases that override the rule-based intent to diagnose
+DIAGNOSE_INDICATORS: List[str] = [
+    "not working", "not cooling", "leaking", "strange", "noise", "broken",
+    "doesn't work", "isn't working", "problem", "issue", "doesn't"
+]
+# Single alternation so the override check is one regex search per query
+_DIAGNOSE_HINT_PATTERN: Pattern = re.compile("|".join(re.escape(i) for i in DIAGNOSE_INDICATORS))
+
+# Every phrase the agent checks for with a substring test
+QUERY_KEYWORDS: Set[str] = set(PART_NAMES) | set(DIAGNOSE_PROBLEMS) | set(DIAGNOSE_INDICATORS) | {
+    "heater", "seal", "refrigerator", "fridge", "dishwasher", "dish washer",
+    "water", "taste", "bad", "add", "put", "remove", "delete", "view", "show", "what", "clear", "empty"
+}
+
+# Zero-width lookahead so every start position reports its longest keyword in one scan
+_KEYWORD_PATTERN: Pattern = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(QUERY_KEYWORDS, key=len, reverse=True)) + "))"
+)
+# Keywords that start with each keyword, including itself; they match wherever it does
+_KEYWORD_PREFIXES: Dict[str, Set[str]] = {
+    keyword: {k for k in QUERY_KEYWORDS if keyword.startswith(k)} for keyword in QUERY_KEYWORDS
+}
+
+def find_keywords(text_lower: str) -> Set[str]:
+    """
+    Return the QUERY_KEYWORDS contained in lowercased text, matching `keyword in text_lower`
+    for each of them but in a single regex pass.
+    """
+    found: Set[str] = set()
+    for longest in _KEYWORD_PATTERN.findall(text_lower):
+        found |= _KEYWORD_PREFIXES[longest]
+    return found
+
+# Pronouns without specific parts that refer back to the conversation
+CONTEXT_PRONOUNS: FrozenSet[str] = frozenset({"it", "this", "that", "them", "these", "those"})
+
+# Common follow-up openings; a plain prefix match, so "install" also covers "installation"
+_FOLLOW_UP_PREFIX_PATTERN: Pattern = re.compile(
+    "|".join(re.escape(p) for p in [
+        "how do i", "how to", "install", "compatible", "will it work", "is it compatible",
+        "where does it go", "how much", "what about", "add to cart", "remove from cart", "check order"
+    ])
+)
+
+# Conjunctions that can join independent requests in one message
+_COMPOUND_SPLIT_PATTERN: Pattern = re.compile(r"\s*;\s*|,?\s+and(?:\s+(?:also|then))?\s+", re.IGNORECASE)
+
+# Openings that make a clause a request of its own, checked in order against the lowercased clause.
+# A message is only split when every clause starts with one, so "install the filter and the
+# ice maker" stays a single install question.
+CLAUSE_INTENT_CUES: List[Tuple[str, Pattern]] = [
+    ("cart", re.compile(r"(?:please\s+)?(?:add|put|remove|delete)\b.*\b(?:cart|basket)\b"
+                        r"|(?:view|show|clear|empty)\s+(?:me\s+)?(?:my\s+|the\s+)?(?:cart|basket)\b")),
+    ("order", re.compile(r"(?:check|track)\s+(?:on\s+)?(?:my\s+|the\s+)?order\b|where\s+is\s+my\s+order\b")),
+    ("compatibility", re.compile(r"(?:is|are|will|does|do|check\s+(?:if|whether))\b.*\b(?:compatible|fits?|work\s+with)\b")),
+    ("install", re.compile(r"(?:how\s+(?:do|can|should)\s+i|how\s+to|show\s+me\s+how\s+to)\s+(?:install|replace)\b|install\b")),
+    ("diagnose", re.compile(r"(?:why|how\s+(?:do|can)\s+i\s+fix|fix|diagnose|troubleshoot)\b")),
+    ("lookup", re.compile(r"(?:find|look\s+up|lookup|search\s+for|get|show\s+me)\b")),
+]
+# Cart and order requests don't name an appliance, so they skip the scope check
+_SCOPE_FREE_INTENTS: FrozenSet[str] = frozenset({"cart", "order"})
+
+# Section headings for the combined answer to a compound message
+INTENT_HEADINGS: Dict[str, str] = {
+    "lookup": "Part lookup",
+    "compatibility": "Compatibility",
+    "install": "Installation",
+    "diagnose": "Diagnosis",
+    "cart": "Cart",
+    "order": "Order status"
+}
+
+# Scope and intent checks are pure functions of the raw text (model patterns are case-sensitive),
+# so repeated questions skip the keyword scans
+@lru_cache(maxsize=4096)
+def _is_in_scope_cached(text: str) -> bool:
+    return is_in_scope(text)
+
+@lru_cache(maxsize=4096)
+def _extract_intent_cached(text: str) -> IntentType:
+    return extract_intent(text)
+
+# Parameters depend only on (intent, text), so one cache serves every agent instance;
+# the items tuple keeps cached results immutable
+@lru_cache(maxsize=4096)
+def _extract_parameters_impl(intent: IntentType, user_input: str) -> Tuple[Tuple[str, str], ...]:
+    """Extract the parameters for an intent from the user's query as (name, value) pairs."""
+    # This is a simplified parameter extraction
+    # In a real system, you might use regex patterns or NER to extract entities
+    params = {}
+    
+    # Convert to lowercase for case-insensitive matching
+    input_lower = user_input.lower()
+    # Known phrases found in the input, collected in one pass
+    keywords = find_keywords(input_lower)
+    
+    if intent == "lookup":
+        # Look for part numbers (simplified)
+        part_match = PART_NUMBER_PATTERN.search(user_input)
+        if part_match:
+            params["part_number"] = part_match.group(0)
+        elif "water filter" in keywords:
+            # Default water filter part for demo purposes
+            params["part_number"] = "W10295370A"
+            params["part_name"] = "water filter"
+        elif "ice maker" in keywords:
+            params["part_number"] = "W10190961"
+            params["part_name"] = "ice maker"
+        elif "control board" in keywords:
+            params["part_number"] = "WPW10503278"
+            params["part_name"] = "control board"
+        elif "heating element" in keywords or "heater" in keywords:
+            params["part_number"] = "WPW10518394"
+            params["part_name"] = "heating element" 
+        elif "drain pump" in keywords:
+            params["part_number"] = "W10348269"
+            params["part_name"] = "drain pump"
+        elif "door gasket" in keywords or "seal" in keywords:
+            params["part_number"] = "WPW10438677"
+            params["part_name"] = "door gasket"
+        else:
+            # Extract part names if no specific part number
+            for part in PART_NAMES:
+                if part in keywords:
+                    params["part_name"] = part
+                    break
+    
+    elif intent == "compatibility":
+        # Look for part number and model number
+        part_match = PART_NUMBER_PATTERN.search(user_input)
+        if part_match:
+            params["part_number"] = part_match.group(0)
+        
+        # Look for model numbers
+        model_match = MODEL_NUMBER_PATTERN.search(user_input)
+        if model_match and model_match.group(0) != params.get("part_number", ""):
+            params["model_number"] = model_match.group(0)
+        
+        # If we found a model but no part, and "water filter" is mentioned
+        if "model_number" in params and "part_number" not in params and "water filter" in keywords:
+            params["part_number"] = "W10295370A"
+            params["part_name"] = "water filter"
+    
+    elif intent in ["install", "diagnose"]:
+        # Detect appliance type
+        if "refrigerator" in keywords or "fridge" in keywords:
+            params["appliance_type"] = "refrigerator"
+        elif "dishwasher" in keywords or "dish washer" in keywords:
+            params["appliance_type"] = "dishwasher"
+        
+        # For install intent, look for part names
+        if intent == "install":
+            for part in PART_NAMES:
+                if part in keywords:
+                    params["part_name"] = part
+                    break
+        
+        # For diagnose intent, look for problems
+        elif intent == "diagnose":
+            for problem in DIAGNOSE_PROBLEMS:
+                if problem in keywords:
+                    params["problem"] = problem
+                    break
+            
+            # Special case for "water tastes strange"
+            if "water" in keywords and ("taste" in keywords or "strange" in keywords or "bad" in keywords):
+                params["problem"] = "water filter"
+                params["part_name"] = "water filter"
+    
+    elif intent == "cart":
+        # Extract parameters for cart operations
+        # Look for part numbers
+        part_match = PART_NUMBER_PATTERN.search(user_input)
+        if part_match:
+            params["part_number"] = part_match.group(0)
+            
+        # Extract quantities if mentioned
+        quantity_match = QUANTITY_PATTERN.search(input_lower)
+        if quantity_match:
+            params["quantity"] = quantity_match.group(1)
+        else:
+            # Default quantity
+            params["quantity"] = "1"
+            
+        # Determine cart operation
+        if "add" in keywords or "put" in keywords:
+            params["action"] = "add"
+        elif "remove" in keywords or "delete" in keywords:
+            params["action"] = "remove"
+        elif "view" in keywords or "show" in keywords or "what" in keywords:
+            params["action"] = "view"
+        elif "clear" in keywords or "empty" in keywords:
+            params["action"] = "clear"
+        else:
+            params["action"] = "view"  # Default action
+    
+    elif intent == "order":
+        # Extract parameters for order status
+        # Look for order numbers
+        order_match = ORDER_NUMBER_PATTERN.search(input_lower)
+        if order_match:
+            params["order_number"] = order_match.group(1)
+            
+        # Look for email addresses
+        email_match = EMAIL_PATTERN.search(user_input)
+        if email_match:
+            params["email"] = email_match.group(0)
+    
+    logger.debug(f"Extracted parameters for {intent}: {params}")
+    return tuple(params.items())
+
+# Marks a lazily created attribute that has not been built yet
+_UNSET = object()
+
+def _result_events(response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split a response dict into its result and follow_up stream events."""
+    yield {"type": "result", **{key: value for key, value in response.items() if key != "follow_up"}}
+    yield {"type": "follow_up", "follow_up": response.get("follow_up")}
+
+@dataclass(slots=True)
+class ConversationContext:
+    """What the previous turns mentioned, for resolving follow-up queries."""
+    last_intent: Optional[str] = None
+    last_part_number: Optional[str] = None
+    last_part_name: Optional[str] = None
+    last_model_number: Optional[str] = None
+    last_appliance_type: Optional[str] = None
+
 class PartSelectAgent:
     """
     Agent for handling appliance part queries using LangChain tools.
     Orchestrates intent detection and tool selection based on user input.
     """
     
+    # One agent lives per session, so skip the per-instance __dict__
+    __slots__ = (
+        "catalog_client", "docs_client", "redis_url", "deepseek_api_key", "response_cache",
+        "_http", "_redis_pool", "_llm", "_intent_classification_tool",
+        "product_lookup_tool", "compatibility_tool", "installation_guide_tool", "error_diagnosis_tool",
+        "cart_tool", "order_status_tool", "intent_tool_map", "_intent_handlers", "conversation_context"
+    )
+    
     def __init__(self, 
                 catalog_client: Optional[AsyncCatalogClient] = None,
                 docs_client: Optional[AsyncDocsClient] = None,
@@ -62,6 +352,14 @@ class PartSelectAgent:
         # Store Redis URL for cart tool
         self.redis_url = redis_url
         
+        # Cache of tool results, shared across agents through the same Redis
+        self.response_cache = self._create_response_cache()
+        
+        # Connection pools shared by every tool; the HTTP session is opened on first use
+        # because it has to be created inside the running event loop
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._redis_pool = redis.ConnectionPool.from_url(self.redis_url, max_connections=32)
+        
         # Get Deepseek API key
         self.deepseek_api_key = deepseek_api_key or os.getenv("DEEPSEEK_API_KEY")
         if not self.deepseek_api_key:
@@ -70,29 +368,19 @@ class PartSelectAgent:
         # Initialize tools
         self._init_tools()
         
-        # Create LLM for agent reasoning (if API key is available and ChatDeepseek is importable)
-        self.llm = self._create_llm() if self.deepseek_api_key and ChatDeepseek else None
-        if not self.llm and self.deepseek_api_key:
+        # The LLM and intent classifier are created on first use (see the llm property)
+        self._llm = _UNSET
+        self._intent_classification_tool = _UNSET
+        if self.deepseek_api_key and not ChatDeepseek:
             logger.warning("ChatDeepseek could not be imported. LLM-based classification will not work.")
             
         # Add conversation context tracking
-        self.conversation_context = {
-            "last_intent": None,
-            "last_part_number": None,
-            "last_part_name": None,
-            "last_model_number": None,
-            "last_appliance_type": None
-        }
+        self.conversation_context = ConversationContext()
         
         logger.info("PartSelectAgent initialized with all tools")
     
     def _init_tools(self):
         """Initialize all the LangChain-compatible tools."""
-        # Create the intent classification tool
-        self.intent_classification_tool = IntentClassificationTool(
-            deepseek_api_key=self.deepseek_api_key
-        ) if self.deepseek_api_key else None
-        
         # Create the main tools for handling different intents
         self.product_lookup_tool = SimpleProductLookupTool(catalog_client=self.catalog_client)
         self.compatibility_tool = SimpleCompatibilityTool(catalog_client=self.catalog_client)
@@ -103,8 +391,14 @@ class PartSelectAgent:
         )
         
         # Add new tools for cart management and order status
-        self.cart_tool = CartTool(redis_url=self.redis_url)
-        self.order_status_tool = OrderStatusTool(api_base_url="https://api.partselect.com/v1")
+        self.cart_tool = CartTool(
+            redis_url=self.redis_url,
+            redis_client=redis.Redis(connection_pool=self._redis_pool)
+        )
+        self.order_status_tool = OrderStatusTool(
+            api_base_url="https://api.partselect.com/v1",
+            get_session=self._http_session
+        )
         
         # Map intents to tools
         self.intent_tool_map = {
@@ -115,6 +409,67 @@ class PartSelectAgent:
             "cart": self.cart_tool,
             "order": self.order_status_tool
         }
+        
+        # Map intents to the methods that build each tool's query and follow-up
+        self._intent_handlers: Dict[str, Callable[[Dict[str, str]], Tuple[str, Optional[str]]]] = {
+            "lookup": self._lookup_query,
+            "compatibility": self._compatibility_query,
+            "install": self._install_query,
+            "diagnose": self._diagnose_query,
+            "cart": self._cart_query,
+            "order": self._order_query
+        }
+    
+    @property
+    def intent_classification_tool(self) -> Optional[IntentClassificationTool]:
+        """LLM intent classifier, created on the first rule-based miss."""
+        if self._intent_classification_tool is _UNSET:
+            self._intent_classification_tool = IntentClassificationTool(
+                deepseek_api_key=self.deepseek_api_key
+            ) if self.deepseek_api_key else None
+        return self._intent_classification_tool
+    
+    @intent_classification_tool.setter
+    def intent_classification_tool(self, tool: Optional[IntentClassificationTool]):
+        self._intent_classification_tool = tool
+    
+    @property
+    def llm(self) -> Optional[BaseChatModel]:
+        """Deepseek LLM for agent reasoning, created on first access."""
+        if self._llm is _UNSET:
+            self._llm = self._create_llm() if self.deepseek_api_key and ChatDeepseek else None
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm: Optional[BaseChatModel]):
+        self._llm = llm
+    
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, opening it on first use."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Close the shared HTTP session and Redis connections."""
+        if self._http is not None:
+            await self._http.close()
+        self._redis_pool.disconnect()
+        if self.response_cache is not None:
+            await self.response_cache.close()
+    
+    def _create_response_cache(self):
+        """Create the async Redis client used to cache tool results."""
+        if not aioredis:
+            return None
+        
+        try:
+            return aioredis.Redis.from_url(self.redis_url, decode_responses=True, socket_connect_timeout=1)
+        except Exception as e:
+            logger.error(f"Error creating Redis response cache: {e}")
+            return None
     
     def _create_llm(self) -> Optional[BaseChatModel]:
         """Create the Deepseek LLM for agent reasoning."""
@@ -142,36 +497,71 @@ class PartSelectAgent:
         Returns:
             Dictionary with tool name, result, and optional follow-up
         """
+        response: Dict[str, Any] = {}
+        async for event in self.process_query_stream(user_input):
+            if event["type"] in ("result", "follow_up"):
+                response.update((key, value) for key, value in event.items() if key != "type")
+        return response
+    
+    async def process_query_stream(self, user_input: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user query, yielding events as each stage completes so clients can
+        show progress before the tool finishes.
+        
+        Args:
+            user_input: The user's query text
+            
+        Yields:
+            {"type": "intent", "intent": ...} once the intent is known,
+            {"type": "ack", "tool": ...} before a tool starts,
+            {"type": "result", "tool_name": ..., "result": ...} with the tool output, and
+            {"type": "follow_up", "follow_up": ...} last
+        """
+        # Lowercase once; the helpers below reuse it instead of lowering the input again
+        input_lower = user_input.lower()
+        
         # Check for context-dependent queries
-        if self._is_context_dependent_query(user_input):
+        if self._is_context_dependent_query(user_input, input_lower):
             logger.info(f"Handling context-dependent query: {user_input}")
-            intent, enhanced_query = self._enhance_query_with_context(user_input)
+            intent, enhanced_query = self._enhance_query_with_context(user_input, input_lower)
             if intent and enhanced_query:
                 logger.info(f"Enhanced query: {enhanced_query} with intent: {intent}")
-                return await self._run_tool_for_intent(intent, enhanced_query)
+                yield {"type": "intent", "intent": intent}
+                tool = self.intent_tool_map.get(intent)
+                if tool is not None:
+                    yield {"type": "ack", "tool": tool.name}
+                for event in _result_events(await self._run_tool_for_intent(intent, enhanced_query)):
+                    yield event
+                return
+        
+        # Compound messages with independent requests run their tools concurrently;
+        # checked before the scope test because cart and order clauses name no appliance
+        sub_intents = self._extract_multi_intent(user_input)
+        if len(sub_intents) > 1:
+            logger.info(f"Handling compound query with intents {[i for i, _ in sub_intents]}: {user_input}")
+            yield {"type": "intent", "intent": "multi_intent", "intents": [intent for intent, _ in sub_intents]}
+            for event in _result_events(await self._run_multi_intent(sub_intents)):
+                yield event
+            return
         
         # Normal query processing flow
         # Step 1: Check if query is in scope
-        if not is_in_scope(user_input):
+        if not _is_in_scope_cached(user_input):
             logger.info(f"Query out of scope: {user_input}")
-            return {
+            for event in _result_events({
                 "tool_name": "out_of_scope",
                 "result": "I'm sorry, but I can only help with questions about refrigerator and dishwasher parts.",
                 "follow_up": None
-            }
+            }):
+                yield event
+            return
         
         # Step 2: Extract intent using rule-based system
-        initial_intent = extract_intent(user_input)
+        initial_intent = _extract_intent_cached(user_input)
         
         # Special handling for common issues in intent detection
-        input_lower = user_input.lower()
         # Likely diagnose intents that might be misclassified
-        if ("not working" in input_lower or "not cooling" in input_lower or 
-            "leaking" in input_lower or "strange" in input_lower or 
-            "noise" in input_lower or "broken" in input_lower or
-            "doesn't work" in input_lower or "isn't working" in input_lower or
-            "problem" in input_lower or "issue" in input_lower or
-            "doesn't" in input_lower or "doesn't" in input_lower):
+        if _DIAGNOSE_HINT_PATTERN.search(input_lower):
             intent = "diagnose"
             logger.info(f"Overriding intent to diagnose based on problem indicators in: {user_input}")
         else:
@@ -181,7 +571,8 @@ class PartSelectAgent:
         if intent == "out_of_scope" and self.intent_classification_tool:
             logger.info(f"Rule-based intent unclear, using LLM classification for: {user_input}")
             try:
-                intent = self.intent_classification_tool._run(user_input)
+                # The classifier makes a blocking HTTP call, so keep it off the event loop
+                intent = await asyncio.to_thread(self.intent_classification_tool._run, user_input)
                 logger.info(f"LLM classified intent: {intent}")
             except Exception as e:
                 logger.error(f"Error using intent classification tool: {e}")
@@ -189,19 +580,82 @@ class PartSelectAgent:
         
         # If still out_of_scope, reply with fallback
         if intent == "out_of_scope":
-            return {
+            for event in _result_events({
                 "tool_name": "out_of_scope",
                 "result": "I understand your question is about appliance parts, but I'm not sure how to help specifically. Could you please rephrase your question about refrigerator or dishwasher parts?",
                 "follow_up": "Try asking about finding a specific part, checking compatibility, installation instructions, or diagnosing a problem."
-            }
+            }):
+                yield event
+            return
+        
+        yield {"type": "intent", "intent": intent}
         
         # Step 3: Map intent to tool and run it
+        tool = self.intent_tool_map.get(intent)
+        if tool is not None:
+            yield {"type": "ack", "tool": tool.name}
         result = await self._run_tool_for_intent(intent, user_input)
         
         # Step 4: Update conversation context with this query
         self._update_conversation_context(intent, user_input, result)
         
-        return result
+        for event in _result_events(result):
+            yield event
+    
+    def _extract_multi_intent(self, user_input: str) -> List[Tuple[IntentType, str]]:
+        """
+        Split a compound message into independent requests.
+        
+        Args:
+            user_input: The user's query
+            
+        Returns:
+            (intent, sub-query) pairs, or an empty list unless every part opens with its own
+            intent cue (see CLAUSE_INTENT_CUES), is in scope where that applies, and has an
+            intent with a tool that differs from the other parts
+        """
+        parts = [part.strip() for part in _COMPOUND_SPLIT_PATTERN.split(user_input) if part.strip()]
+        if len(parts) < 2:
+            return []
+        
+        sub_intents: List[Tuple[IntentType, str]] = []
+        for part in parts:
+            part_lower = part.lower()
+            intent = next((intent for intent, cue in CLAUSE_INTENT_CUES if cue.match(part_lower)), None)
+            if intent is None or intent not in self.intent_tool_map:
+                return []
+            if intent not in _SCOPE_FREE_INTENTS and not _is_in_scope_cached(part):
+                return []
+            if any(intent == seen for seen, _ in sub_intents):
+                return []
+            sub_intents.append((intent, part))
+        return sub_intents
+    
+    async def _run_multi_intent(self, sub_intents: List[Tuple[IntentType, str]]) -> Dict[str, Any]:
+        """
+        Run the tools for several independent requests concurrently and combine their answers.
+        
+        Args:
+            sub_intents: (intent, sub-query) pairs from _extract_multi_intent
+            
+        Returns:
+            Dictionary with the combined result, the first follow-up, and the individual results
+        """
+        results = await asyncio.gather(
+            *(self._run_tool_for_intent(intent, query) for intent, query in sub_intents)
+        )
+        for (intent, query), result in zip(sub_intents, results):
+            self._update_conversation_context(intent, query, result)
+        
+        return {
+            "tool_name": "multi_intent",
+            "result": "\n\n".join(
+                f"{INTENT_HEADINGS.get(intent, intent)}:\n{result['result']}"
+                for (intent, _), result in zip(sub_intents, results)
+            ),
+            "follow_up": next((result["follow_up"] for result in results if result.get("follow_up")), None),
+            "results": list(results)
+        }
     
     async def _run_tool_for_intent(self, intent: IntentType, user_input: str) -> Dict[str, Any]:
         """
@@ -215,7 +669,8 @@ class PartSelectAgent:
             Dictionary with tool name, result, and optional follow-up
         """
         # Skip if intent not in our map
-        if intent not in self.intent_tool_map:
+        tool = self.intent_tool_map.get(intent)
+        if tool is None:
             logger.warning(f"No tool mapped for intent: {intent}")
             return {
                 "tool_name": "unknown_intent",
@@ -223,132 +678,31 @@ class PartSelectAgent:
                 "follow_up": None
             }
         
-        tool = self.intent_tool_map[intent]
         logger.info(f"Running tool {tool.name} for intent: {intent}")
         
         # Extract parameters from user input based on intent
         params = self._extract_parameters(intent, user_input)
         
         try:
-            # Call the appropriate async method based on intent
-            if intent == "lookup":
-                # For lookup, we need to extract a part number
-                part_number = params.get("part_number", "")
-                result = await self._async_run_tool(tool, part_number)
-                
-                # Generate a follow-up for successful lookups
-                follow_up = self._generate_follow_up(intent, result)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": follow_up
-                }
-                
-            elif intent == "compatibility":
-                # For compatibility, format as part_number:model_number
-                query = f"{params.get('part_number', '')}:{params.get('model_number', '')}"
-                result = await self._async_run_tool(tool, query)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": "Would you like to see installation instructions for this part?"
-                }
-                
-            elif intent == "install":
-                # For installation, format as part_name:appliance_type
-                query = f"{params.get('part_name', '')}"
-                if params.get('appliance_type'):
-                    query += f":{params.get('appliance_type')}"
-                    
-                result = await self._async_run_tool(tool, query)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": "Do you need help finding this part?"
-                }
-                
-            elif intent == "diagnose":
-                # For diagnosis, format as problem:appliance_type
-                query = f"{params.get('problem', '')}"
-                if params.get('appliance_type'):
-                    query += f":{params.get('appliance_type')}"
-                    
-                result = await self._async_run_tool(tool, query)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": "Would you like me to help you find any of these parts?"
-                }
-                
-            elif intent == "cart":
-                # For cart operations, we need action and possibly part number
-                params = self._extract_parameters(intent, user_input)
-                action = params.get("action", "view")
-                
-                if action == "add" and "part_number" in params:
-                    part_number = params["part_number"]
-                    quantity = params.get("quantity", "1")
-                    query = f"add:{part_number}:{quantity}"
-                elif action == "remove" and "part_number" in params:
-                    part_number = params["part_number"]
-                    query = f"remove:{part_number}"
-                elif action == "clear":
-                    query = "clear"
-                else:
-                    # Default to view
-                    query = "view"
-                
-                result = await self._async_run_tool(tool, query)
-                
-                # Generate appropriate follow-up based on action
-                if action == "add":
-                    follow_up = "Would you like to view your cart or continue shopping?"
-                elif action == "view":
-                    follow_up = "Would you like to checkout or continue shopping?"
-                else:
-                    follow_up = "Is there anything else you'd like to do with your cart?"
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": follow_up
-                }
-                
-            elif intent == "order":
-                # For order status, format as order_number:email or just one of them
-                params = self._extract_parameters(intent, user_input)
-                
-                if "order_number" in params and "email" in params:
-                    query = f"{params['order_number']}:{params['email']}"
-                elif "order_number" in params:
-                    query = params["order_number"]
-                elif "email" in params:
-                    query = f"email:{params['email']}"
-                else:
-                    # Generic query for order status
-                    query = "status"
-                
-                result = await self._async_run_tool(tool, query)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": "Would you like to check another order or continue shopping?"
-                }
-                
+            # Format the tool query and pick the follow-up for this intent
+            handler = self._intent_handlers.get(intent)
+            if handler:
+                query, follow_up = handler(params)
             else:
                 # Generic fallback
-                result = await self._async_run_tool(tool, user_input)
-                
-                return {
-                    "tool_name": tool.name,
-                    "result": result,
-                    "follow_up": None
-                }
+                query, follow_up = user_input, None
+            
+            result = await self._cached_run_tool(intent, tool, query)
+            
+            # Lookups get a follow-up based on the part that was found
+            if intent == "lookup":
+                follow_up = self._generate_follow_up(intent, result)
+            
+            return {
+                "tool_name": tool.name,
+                "result": result,
+                "follow_up": follow_up
+            }
                 
         except Exception as e:
             logger.error(f"Error running tool {tool.name}: {e}")
@@ -358,6 +712,107 @@ class PartSelectAgent:
                 "follow_up": "Could you try rephrasing your question?"
             }
     
+    def _lookup_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For lookup, we need to extract a part number."""
+        return params.get("part_number", ""), None
+    
+    def _compatibility_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For compatibility, format as part_number:model_number."""
+        query = params.get("part_number", "") + ":" + params.get("model_number", "")
+        return query, "Would you like to see installation instructions for this part?"
+    
+    def _install_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For installation, format as part_name:appliance_type."""
+        appliance_type = params.get("appliance_type")
+        query = params.get("part_name", "") + (":" + appliance_type if appliance_type else "")
+        return query, "Do you need help finding this part?"
+    
+    def _diagnose_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For diagnosis, format as problem:appliance_type."""
+        appliance_type = params.get("appliance_type")
+        query = params.get("problem", "") + (":" + appliance_type if appliance_type else "")
+        return query, "Would you like me to help you find any of these parts?"
+    
+    def _cart_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For cart operations, we need action and possibly part number."""
+        action = params.get("action", "view")
+        
+        if action == "add" and "part_number" in params:
+            part_number = params["part_number"]
+            quantity = params.get("quantity", "1")
+            query = f"add:{part_number}:{quantity}"
+        elif action == "remove" and "part_number" in params:
+            part_number = params["part_number"]
+            query = f"remove:{part_number}"
+        elif action == "clear":
+            query = "clear"
+        else:
+            # Default to view
+            query = "view"
+        
+        # Generate appropriate follow-up based on action
+        if action == "add":
+            follow_up = "Would you like to view your cart or continue shopping?"
+        elif action == "view":
+            follow_up = "Would you like to checkout or continue shopping?"
+        else:
+            follow_up = "Is there anything else you'd like to do with your cart?"
+        
+        return query, follow_up
+    
+    def _order_query(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """For order status, format as order_number:email or just one of them."""
+        if "order_number" in params and "email" in params:
+            query = f"{params['order_number']}:{params['email']}"
+        elif "order_number" in params:
+            query = params["order_number"]
+        elif "email" in params:
+            query = f"email:{params['email']}"
+        else:
+            # Generic query for order status
+            query = "status"
+        
+        return query, "Would you like to check another order or continue shopping?"
+    
+    async def _cached_run_tool(self, intent: IntentType, tool, query: str) -> str:
+        """
+        Run a tool, reusing a cached result for the same intent and tool query.
+        Keying on the formatted query lets different phrasings of one question share an entry.
+        Error and not-found results are only kept for RESPONSE_ERROR_TTL.
+        Redis errors fail open and switch the cache off for this agent.
+        """
+        if self.response_cache is None or intent in UNCACHED_INTENTS:
+            return await self._async_run_tool(tool, query)
+        
+        key = f"psagent:tool:{intent}:{hashlib.sha256(query.encode()).hexdigest()}"
+        try:
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                logger.info(f"Tool result cache hit for intent: {intent}")
+                return cached
+        except Exception as e:
+            await self._disable_response_cache(e)
+        
+        result = await self._async_run_tool(tool, query)
+        
+        if self.response_cache is not None and isinstance(result, str):
+            ttl = RESPONSE_ERROR_TTL if result.startswith(ERROR_RESULT_PREFIXES) else RESPONSE_CACHE_TTL
+            try:
+                await self.response_cache.set(key, result, ex=ttl)
+            except Exception as e:
+                await self._disable_response_cache(e)
+        
+        return result
+    
+    async def _disable_response_cache(self, error: Exception):
+        """Stop using the tool result cache after a Redis error and close its connections."""
+        logger.warning(f"Disabling tool result cache after Redis error: {error}")
+        cache, self.response_cache = self.response_cache, None
+        try:
+            await cache.close()
+        except Exception as e:
+            logger.debug(f"Error closing Redis response cache: {e}")
+    
     async def _async_run_tool(self, tool, query: str) -> str:
         """Run a tool asynchronously."""
         # Access the _arun method for our simple tools
@@ -380,143 +835,7 @@ class PartSelectAgent:
         Returns:
             Dictionary of extracted parameters
         """
-        # This is a simplified parameter extraction
-        # In a real system, you might use regex patterns or NER to extract entities
-        params = {}
-        
-        # Convert to lowercase for case-insensitive matching
-        input_lower = user_input.lower()
-        
-        if intent == "lookup":
-            # Look for part numbers (simplified)
-            import re
-            # Look for patterns like "W10295370A" or "67003753"
-            part_match = re.search(r'([a-zA-Z]{0,3}\d{4,10}[a-zA-Z0-9]{0,5})', user_input)
-            if part_match:
-                params["part_number"] = part_match.group(0)
-            elif "water filter" in input_lower:
-                # Default water filter part for demo purposes
-                params["part_number"] = "W10295370A"
-                params["part_name"] = "water filter"
-            elif "ice maker" in input_lower:
-                params["part_number"] = "W10190961"
-                params["part_name"] = "ice maker"
-            elif "control board" in input_lower:
-                params["part_number"] = "WPW10503278"
-                params["part_name"] = "control board"
-            elif "heating element" in input_lower or "heater" in input_lower:
-                params["part_number"] = "WPW10518394"
-                params["part_name"] = "heating element" 
-            elif "drain pump" in input_lower:
-                params["part_number"] = "W10348269"
-                params["part_name"] = "drain pump"
-            elif "door gasket" in input_lower or "seal" in input_lower:
-                params["part_number"] = "WPW10438677"
-                params["part_name"] = "door gasket"
-            else:
-                # Extract part names if no specific part number
-                for part in ["water filter", "ice maker", "control board", "heating element", 
-                            "drain pump", "door gasket"]:
-                    if part in input_lower:
-                        params["part_name"] = part
-                        break
-        
-        elif intent == "compatibility":
-            # Look for part number and model number
-            import re
-            # Look for patterns like "W10295370A" or "67003753"
-            part_match = re.search(r'([a-zA-Z]{0,3}\d{4,10}[a-zA-Z0-9]{0,5})', user_input)
-            if part_match:
-                params["part_number"] = part_match.group(0)
-            
-            # Look for model numbers (usually alphanumeric)
-            model_match = re.search(r'([a-zA-Z]{2,5}\d{3,7}[a-zA-Z0-9]{0,5})', user_input)
-            if model_match and model_match.group(0) != params.get("part_number", ""):
-                params["model_number"] = model_match.group(0)
-            
-            # If we found a model but no part, and "water filter" is mentioned
-            if "model_number" in params and "part_number" not in params and "water filter" in input_lower:
-                params["part_number"] = "W10295370A"
-                params["part_name"] = "water filter"
-        
-        elif intent in ["install", "diagnose"]:
-            # Detect appliance type
-            if "refrigerator" in input_lower or "fridge" in input_lower:
-                params["appliance_type"] = "refrigerator"
-            elif "dishwasher" in input_lower or "dish washer" in input_lower:
-                params["appliance_type"] = "dishwasher"
-            
-            # For install intent, look for part names
-            if intent == "install":
-                for part in ["water filter", "ice maker", "control board", "heating element", 
-                            "drain pump", "door gasket"]:
-                    if part in input_lower:
-                        params["part_name"] = part
-                        break
-            
-            # For diagnose intent, look for problems
-            elif intent == "diagnose":
-                problems = [
-                    "not cooling", "no water", "leaking", "not draining", 
-                    "making noise", "not working", "ice maker", "no ice",
-                    "water dispenser", "not running", "door", "light", "strange taste"
-                ]
-                
-                for problem in problems:
-                    if problem in input_lower:
-                        params["problem"] = problem
-                        break
-                
-                # Special case for "water tastes strange"
-                if "water" in input_lower and ("taste" in input_lower or "strange" in input_lower or "bad" in input_lower):
-                    params["problem"] = "water filter"
-                    params["part_name"] = "water filter"
-        
-        elif intent == "cart":
-            # Extract parameters for cart operations
-            import re
-            
-            # Look for part numbers
-            part_match = re.search(r'([a-zA-Z]{0,3}\d{4,10}[a-zA-Z0-9]{0,5})', user_input)
-            if part_match:
-                params["part_number"] = part_match.group(0)
-                
-            # Extract quantities if mentioned
-            quantity_match = re.search(r'(\d+)\s+(pcs|pieces|units|quantity)', input_lower)
-            if quantity_match:
-                params["quantity"] = quantity_match.group(1)
-            else:
-                # Default quantity
-                params["quantity"] = "1"
-                
-            # Determine cart operation
-            if "add" in input_lower or "put" in input_lower:
-                params["action"] = "add"
-            elif "remove" in input_lower or "delete" in input_lower:
-                params["action"] = "remove"
-            elif "view" in input_lower or "show" in input_lower or "what" in input_lower:
-                params["action"] = "view"
-            elif "clear" in input_lower or "empty" in input_lower:
-                params["action"] = "clear"
-            else:
-                params["action"] = "view"  # Default action
-        
-        elif intent == "order":
-            # Extract parameters for order status
-            import re
-            
-            # Look for order numbers (typically 6-10 digits)
-            order_match = re.search(r'order\s+(?:number\s+)?#?(\d{6,10})', input_lower)
-            if order_match:
-                params["order_number"] = order_match.group(1)
-                
-            # Look for email addresses
-            email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', user_input)
-            if email_match:
-                params["email"] = email_match.group(0)
-        
-        logger.debug(f"Extracted parameters for {intent}: {params}")
-        return params
+        return dict(_extract_parameters_impl(intent, user_input))
     
     def _generate_follow_up(self, intent: IntentType, result: str) -> Optional[str]:
         """
@@ -532,7 +851,7 @@ class PartSelectAgent:
         if intent == "lookup":
             try:
                 # Try to parse the result as JSON
-                result_data = json.loads(result)
+                result_data = orjson.loads(result) if orjson else json.loads(result)
                 
                 # If this is an error response, don't give a follow-up
                 if "error" in result_data:
@@ -542,58 +861,37 @@ class PartSelectAgent:
                 part_name = result_data.get("name", "")
                 if part_name:
                     return f"Would you like installation instructions for the {part_name}?"
-            except:
+            except (ValueError, TypeError, AttributeError):
                 # If we can't parse the JSON, provide a generic follow-up
                 return "Would you like to check compatibility or get installation instructions?"
         
         # For other intents, follow-ups are created in _run_tool_for_intent
         return None 
     
-    def _is_context_dependent_query(self, query: str) -> bool:
+    def _is_context_dependent_query(self, query: str, query_lower: Optional[str] = None) -> bool:
         """
         Check if a query is likely to be referring to previous context.
         For example, "How do I install it?" after asking about a part.
         
         Args:
             query: The user query
+            query_lower: query already lowercased, if the caller has it
             
         Returns:
             True if query is context-dependent
         """
-        query_lower = query.lower().strip()
-        
-        # Check for pronouns without specific parts
-        pronouns = ["it", "this", "that", "them", "these", "those"]
-        
-        # Common follow-up patterns
-        follow_up_patterns = [
-            "how do i",
-            "how to",
-            "install",
-            "compatible",
-            "will it work",
-            "is it compatible",
-            "where does it go",
-            "how much",
-            "what about",
-            "add to cart",
-            "remove from cart",
-            "check order"
-        ]
+        query_lower = (query.lower() if query_lower is None else query_lower).strip()
+        
+        tokens = query_lower.split()
         
         # If query is very short, likely follows up on previous context
-        if len(query_lower.split()) <= 5:
-            for pronoun in pronouns:
-                if pronoun in query_lower.split():
-                    return True
-                    
-            for pattern in follow_up_patterns:
-                if query_lower.startswith(pattern):
-                    return True
+        if len(tokens) <= 5:
+            if not CONTEXT_PRONOUNS.isdisjoint(tokens) or _FOLLOW_UP_PREFIX_PATTERN.match(query_lower):
+                return True
         
         # Handle cart-related follow-up queries
         elif "cart" in query_lower or "add" in query_lower or "basket" in query_lower:
-            if self.conversation_context["last_part_number"]:
+            if self.conversation_context.last_part_number:
                 intent = "cart"
                 action = "add" if "add" in query_lower else "view"
                 
@@ -609,59 +907,61 @@ class PartSelectAgent:
         
         return False
     
-    def _enhance_query_with_context(self, query: str) -> Tuple[Optional[str], Optional[str]]:
+    def _enhance_query_with_context(self, query: str,
+                                    query_lower: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         """
         Enhance a context-dependent query using conversation context.
         
         Args:
             query: The original query
+            query_lower: query already lowercased, if the caller has it
             
         Returns:
             Tuple of (intent, enhanced_query) or (None, None) if can't enhance
         """
-        query_lower = query.lower().strip()
+        query_lower = (query.lower() if query_lower is None else query_lower).strip()
         
         # No context to use
-        if not self.conversation_context["last_intent"]:
+        if not self.conversation_context.last_intent:
             return None, None
             
         # Handle installation follow-up queries
         if ("how" in query_lower and "install" in query_lower) or "installation" in query_lower:
             # If there was a previous part, formulate an installation query
-            if self.conversation_context["last_part_name"]:
+            if self.conversation_context.last_part_name:
                 intent = "install"
-                part_name = self.conversation_context["last_part_name"]
-                appliance = self.conversation_context["last_appliance_type"] or "refrigerator"
+                part_name = self.conversation_context.last_part_name
+                appliance = self.conversation_context.last_appliance_type or "refrigerator"
                 return intent, f"How do I install a {part_name} in my {appliance}?"
                 
         # Handle compatibility follow-up queries
         elif "compatible" in query_lower or "work with" in query_lower:
-            if self.conversation_context["last_part_number"] and self.conversation_context["last_model_number"]:
+            if self.conversation_context.last_part_number and self.conversation_context.last_model_number:
                 intent = "compatibility"
-                return intent, f"Is part {self.conversation_context['last_part_number']} compatible with {self.conversation_context['last_model_number']}?"
+                return intent, f"Is part {self.conversation_context.last_part_number} compatible with {self.conversation_context.last_model_number}?"
                 
         # Handle lookup follow-up queries
         elif "where" in query_lower or "find" in query_lower or "get" in query_lower:
-            if self.conversation_context["last_part_name"]:
+            if self.conversation_context.last_part_name:
                 intent = "lookup"
-                return intent, f"I need a {self.conversation_context['last_part_name']} for my {self.conversation_context['last_appliance_type'] or 'refrigerator'}"
+                return intent, f"I need a {self.conversation_context.last_part_name} for my {self.conversation_context.last_appliance_type or 'refrigerator'}"
         
         # If previous intent was lookup or compatibility and user asks about installation
-        if self.conversation_context["last_intent"] in ["lookup", "compatibility"]:
+        if self.conversation_context.last_intent in ["lookup", "compatibility"]:
             if "install" in query_lower or "how" in query_lower:
                 intent = "install"
-                part_name = self.conversation_context["last_part_name"] or "part"
-                appliance = self.conversation_context["last_appliance_type"] or "refrigerator"
+                part_name = self.conversation_context.last_part_name or "part"
+                appliance = self.conversation_context.last_appliance_type or "refrigerator"
                 return intent, f"How do I install a {part_name} in my {appliance}?"
         
         # Handle cart-related follow-up queries
         elif "cart" in query_lower or "add" in query_lower or "basket" in query_lower:
-            if self.conversation_context["last_part_number"]:
+            if self.conversation_context.last_part_number:
                 intent = "cart"
                 action = "add" if "add" in query_lower else "view"
                 
                 if action == "add":
-                    return intent, f"Add part {self.conversation_context['last_part_number']} to my cart"
+                    return intent, f"Add part {self.conversation_context.last_part_number} to my cart"
                 else:
                     return intent, "View my cart"
         
@@ -682,17 +982,17 @@ class PartSelectAgent:
             result: The result returned by the agent
         """
         # Update last intent
-        self.conversation_context["last_intent"] = intent
+        self.conversation_context.last_intent = intent
         
         # Extract parameters to store in context
         params = self._extract_parameters(intent, query)
         
         # Update context with extracted parameters
         if "part_number" in params:
-            self.conversation_context["last_part_number"] = params["part_number"]
+            self.conversation_context.last_part_number = params["part_number"]
         if "part_name" in params:
-            self.conversation_context["last_part_name"] = params["part_name"]
+            self.conversation_context.last_part_name = params["part_name"]
         if "model_number" in params:
-            self.conversation_context["last_model_number"] = params["model_number"]
+            self.conversation_context.last_model_number = params["model_number"]
         if "appliance_type" in params:
-            self.conversation_context["last_appliance_type"] = params["appliance_type"] 
\ No newline at end of file
+            self.conversation_context.last_appliance_type = params["appliance_type"] 
\ No newline at end of file
@@ -9,7 +9,8 @@ import os
 import sys
 import logging
 import json
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlsplit, urlunsplit
 from dotenv import load_dotenv
 
 # Add the parent directory to the path so we can import modules
@@ -26,54 +27,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def read_urls_from_file(file_path: str) -> List[str]:
+def iter_urls_from_file(file_path: str) -> Iterator[str]:
     """
-    Read URLs from a file, one per line.
+    Lazily read URLs from a file, one per line, without loading the whole file.
     
     Args:
         file_path: Path to the file containing URLs
         
-    Returns:
-        List of URLs
+    Yields:
+        URLs
     """
     if not os.path.exists(file_path):
         logger.error(f"File not found: {file_path}")
-        return []
+        return
     
     try:
         with open(file_path, 'r') as file:
-            # Strip whitespace and filter out empty lines and comments
-            urls = [line.strip() for line in file if line.strip() and not line.strip().startswith('#')]
-        
-        logger.info(f"Read {len(urls)} URLs from {file_path}")
-        return urls
+            for line in file:
+                # Strip whitespace and filter out empty lines and comments
+                url = line.strip()
+                if url and not url.startswith('#'):
+                    yield url
     
     except Exception as e:
         logger.error(f"Error reading file {file_path}: {e}")
-        return []
 
-def get_predefined_patterns() -> List[str]:
+def read_urls_from_file(file_path: str) -> List[str]:
     """
-    Get a list of predefined URL patterns for common documentation sections.
+    Read URLs from a file, one per line.
     
+    Args:
+        file_path: Path to the file containing URLs
+        
     Returns:
-        List of URL patterns
+        List of URLs
     """
-    return [
-        # Installation guides
-        "https://www.partselect.ca/installation/",
-        "https://www.partselect.ca/repair-guide/",
-        "https://www.partselect.ca/DIY/",
-        
-        # Troubleshooting guides
-        "https://www.partselect.ca/troubleshooting/",
-        "https://www.partselect.ca/repair-help/",
-        "https://www.partselect.ca/symptom/",
-        
-        # Maintenance guides
-        "https://www.partselect.ca/maintenance/",
-        "https://www.partselect.ca/care-guide/"
-    ]
+    urls = list(iter_urls_from_file(file_path))
+    logger.info(f"Read {len(urls)} URLs from {file_path}")
+    return urls
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection: lowercase scheme and host,
+    drop the fragment, and ignore a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/', parts.query, ''))
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """
+    Remove URLs that are equivalent under canonical_url, keeping the first
+    spelling of each in its original order.
+    """
+    unique: Dict[str, str] = {}
+    for url in urls:
+        unique.setdefault(canonical_url(url), url)
+    return list(unique.values())
+
+# URL patterns for common documentation sections
+PREDEFINED_PATTERNS: Tuple[str, ...] = (
+    # Installation guides
+    "https://www.partselect.ca/installation/",
+    "https://www.partselect.ca/repair-guide/",
+    "https://www.partselect.ca/DIY/",
+    
+    # Troubleshooting guides
+    "https://www.partselect.ca/troubleshooting/",
+    "https://www.partselect.ca/repair-help/",
+    "https://www.partselect.ca/symptom/",
+    
+    # Maintenance guides
+    "https://www.partselect.ca/maintenance/",
+    "https://www.partselect.ca/care-guide/"
+)
+
+def get_predefined_patterns() -> Tuple[str, ...]:
+    """
+    Get the predefined URL patterns for common documentation sections.
+    
+    Returns:
+        Tuple of URL patterns
+    """
+    return PREDEFINED_PATTERNS
 
 def main():
     """
@@ -104,6 +139,12 @@ def main():
         default=20,
         help="Maximum number of documents to process per URL pattern"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=2,
+        help="Number of URL patterns to crawl in parallel (requests still share one rate limit)"
+    )
     parser.add_argument(
         "--mongodb-uri", 
         default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017"),
@@ -148,6 +189,9 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # Each duplicate would be fetched, parsed and upserted again
+    urls_to_process = dedupe_urls(urls_to_process)
+    
     # Initialize the scraper
     try:
         scraper = DocScraper(
@@ -161,7 +205,7 @@ def main():
     
     # Process URLs
     logger.info(f"Starting crawl of {len(urls_to_process)} URL patterns (max {args.max_per_url} docs per pattern)...")
-    results = scraper.bulk_process_urls(urls_to_process, args.max_per_url)
+    results = scraper.bulk_process_urls(urls_to_process, args.max_per_url, args.concurrency)
     
     # Report results
     logger.info("Crawl completed:")
@@ -8,7 +8,8 @@ import argparse
 import os
 import sys
 import logging
-from typing import List
+from itertools import chain
+from typing import Iterator, List
 from dotenv import load_dotenv
 
 # Add the parent directory to the path so we can import modules
@@ -25,31 +26,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def read_part_numbers(file_path: str) -> List[str]:
+def iter_part_numbers(file_path: str) -> Iterator[str]:
     """
-    Read part numbers from a file, one per line.
+    Lazily read part numbers from a file, one per line, without loading the whole file.
     
     Args:
         file_path: Path to the file containing part numbers
         
-    Returns:
-        List of part numbers
+    Yields:
+        Part numbers
     """
     if not os.path.exists(file_path):
         logger.error(f"File not found: {file_path}")
-        return []
+        return
     
     try:
         with open(file_path, 'r') as file:
-            # Strip whitespace and filter out empty lines
-            part_numbers = [line.strip() for line in file if line.strip()]
-        
-        logger.info(f"Read {len(part_numbers)} part numbers from {file_path}")
-        return part_numbers
+            for line in file:
+                # Strip whitespace and filter out empty lines
+                part_number = line.strip()
+                if part_number:
+                    yield part_number
     
     except Exception as e:
         logger.error(f"Error reading file {file_path}: {e}")
-        return []
+
+def read_part_numbers(file_path: str) -> List[str]:
+    """
+    Read part numbers from a file, one per line.
+    
+    Args:
+        file_path: Path to the file containing part numbers
+        
+    Returns:
+        List of part numbers
+    """
+    part_numbers = list(iter_part_numbers(file_path))
+    logger.info(f"Read {len(part_numbers)} part numbers from {file_path}")
+    return part_numbers
 
 def main():
     """
@@ -83,10 +97,11 @@ def main():
     
     args = parser.parse_args()
     
-    # Read part numbers from file
-    part_numbers = read_part_numbers(args.file)
+    # Stream part numbers from the file so scraping starts before it is fully read
+    part_numbers = iter_part_numbers(args.file)
+    first_part_number = next(part_numbers, None)
     
-    if not part_numbers:
+    if first_part_number is None:
         logger.error("No part numbers found. Exiting.")
         sys.exit(1)
     
@@ -102,11 +117,11 @@ def main():
         sys.exit(1)
     
     # Scrape and ingest part data
-    logger.info(f"Starting ingestion of {len(part_numbers)} parts...")
-    results = scraper.bulk_upsert_parts(part_numbers)
+    logger.info(f"Starting ingestion of parts from {args.file}...")
+    results = scraper.bulk_upsert_parts(chain([first_part_number], part_numbers))
     
     # Report results
-    logger.info("Ingestion completed:")
+    logger.info(f"Ingestion completed for {results['success'] + results['failure']} parts:")
     logger.info(f"  Successfully processed: {results['success']}")
     logger.info(f"  Failed to process: {results['failure']}")
     
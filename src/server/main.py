@@ -8,7 +8,8 @@ import os
 import logging
 import json
 import asyncio
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Union
 
 import uvicorn
 from fastapi import FastAPI, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
@@ -16,8 +17,30 @@ from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from modules.tools import AsyncCatalogClient, AsyncDocsClient
+from health import router as health_router
+
+# orjson serializes much faster than the stdlib json module; fall back to json without it
+try:
+    import orjson
+    
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    dumps = json.dumps
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
+# uvloop is a faster drop-in event loop; it is not available on Windows
+try:
+    import uvloop  # noqa: F401
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    EVENT_LOOP = "asyncio"
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +65,8 @@ class Settings(BaseSettings):
     deepseek_api_key: Optional[str] = None
     log_level: Optional[str] = None
     rate_limit_delay: Optional[int] = 2  # Default value of 2 seconds
+    chat_simulated_delay_ms: int = 0  # Artificial /chat reply delay, only applied in debug mode
+    cors_origins: List[str] = ["*"]  # JSON list in CORS_ORIGINS; restrict in production
     
     # Use field_validator instead of validator
     @field_validator('rate_limit_delay', mode='before')
@@ -66,41 +91,54 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the settings once; later calls (and Depends(get_settings)) share the instance."""
+    try:
+        settings = Settings()
+        logger.info(f"Loaded settings for {settings.app_name}")
+        return settings
+    except Exception as e:
+        logger.error(f"Error loading settings: {e}")
+        # Use defaults if .env is not available
+        logger.warning("Using default settings")
+        return Settings(
+            app_name="PartSelect Agent API (Default)",
+            mongodb_uri="mongodb://localhost:27017",
+            database_name="partselect",
+            debug=True
+        )
+
 # Create settings instance
-try:
-    settings = Settings()
-    logger.info(f"Loaded settings for {settings.app_name}")
-except Exception as e:
-    logger.error(f"Error loading settings: {e}")
-    # Use defaults if .env is not available
-    settings = Settings(
-        app_name="PartSelect Agent API (Default)",
-        mongodb_uri="mongodb://localhost:27017",
-        database_name="partselect",
-        debug=True
-    )
-    logger.warning("Using default settings")
+settings = get_settings()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     description="API for accessing appliance parts and documentation",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 # Add CORS middleware
+# Explicit methods and headers instead of wildcards; browsers cache the preflight for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # For development; restrict in production
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400
 )
 
-# Client dependency functions
-def get_catalog_client():
-    """Get an instance of the AsyncCatalogClient."""
+# Compress larger JSON responses such as doc search results
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Client dependency functions; cached so every request shares one client and its connection pool
+@lru_cache(maxsize=1)
+def get_catalog_client() -> AsyncCatalogClient:
+    """Get the shared AsyncCatalogClient."""
     return AsyncCatalogClient(
         mongodb_uri=settings.mongodb_uri,
         database_name=settings.database_name,
@@ -108,8 +146,9 @@ def get_catalog_client():
         use_mock=True  # Using mock data for now
     )
 
-def get_docs_client():
-    """Get an instance of the AsyncDocsClient."""
+@lru_cache(maxsize=1)
+def get_docs_client() -> AsyncDocsClient:
+    """Get the shared AsyncDocsClient."""
     return AsyncDocsClient(
         mongodb_uri=settings.mongodb_uri,
         database_name=settings.database_name,
@@ -120,23 +159,33 @@ def get_docs_client():
 # Connection manager for WebSockets
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info(f"Client connected. Active connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
         logger.info(f"Client disconnected. Active connections: {len(self.active_connections)}")
 
     async def send_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        # Send to everyone at once so one slow socket doesn't hold up the rest
+        connections = tuple(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True
+        )
+
+        # Drop sockets whose send failed
+        dead = {connection for connection, result in zip(connections, results) if isinstance(result, Exception)}
+        if dead:
+            self.active_connections -= dead
+            logger.info(f"Dropped {len(dead)} dead connections. Active connections: {len(self.active_connections)}")
 
 # Create connection manager instance
 manager = ConnectionManager()
@@ -161,11 +210,12 @@ async def websocket_endpoint(websocket: WebSocket):
                 ]
             }
             
-            # Delay to simulate processing
-            await asyncio.sleep(1)
+            # Optional delay to simulate processing during development
+            if settings.debug and settings.chat_simulated_delay_ms:
+                await asyncio.sleep(settings.chat_simulated_delay_ms / 1000)
             
             # Send response back to client
-            await manager.send_message(json.dumps(response), websocket)
+            await manager.send_message(dumps(response), websocket)
             
     except WebSocketDisconnect:
         logger.info("Client disconnected")
@@ -174,13 +224,17 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
     """
-    Health check endpoint to verify API is running.
+    Liveness endpoint to verify API is running.
+    Does not touch dependencies; use /health/ready for those.
     
     Returns:
         Dictionary with status information
     """
     return {"status": "ok"}
 
+# Readiness endpoint at /health/ready
+app.include_router(health_router, prefix="/health")
+
 @app.get("/api/parts/{part_number}")
 async def get_part(
     part_number: str,
@@ -374,5 +428,6 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=9000,
-        reload=settings.debug
+        reload=settings.debug,
+        loop=EVENT_LOOP
     )
@@ -4,8 +4,12 @@ Provides methods that combine rule-based and LLM-based intent classification.
 """
 
 import os
+import time
 import logging
-from typing import Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
 from .validators import extract_intent, IntentType, is_in_scope
 from .tools import IntentClassificationTool
 
@@ -13,6 +17,59 @@ from .tools import IntentClassificationTool
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only queries up to this length are cached; longer inputs are rarely repeated verbatim
+MAX_CACHED_QUERY_LENGTH = 256
+
+# LLM classifications are reused for an hour. The tool reports API errors as out_of_scope,
+# so that answer expires sooner to avoid pinning a transient failure.
+LLM_CACHE_TTL = 3600
+LLM_OUT_OF_SCOPE_TTL = 60
+LLM_CACHE_SIZE = 2048
+
+# Normalized query -> (expiry on the monotonic clock, intent), in LRU order
+_llm_cache: "OrderedDict[str, Tuple[float, IntentType]]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=4096)
+def _cached_extract_intent(query: str) -> IntentType:
+    return extract_intent(query)
+
+def _rule_based_intent(query: str) -> IntentType:
+    """
+    Rule-based intent, cached per exact query.
+    The raw text is the key because model-number matching is case-sensitive.
+    """
+    if len(query) > MAX_CACHED_QUERY_LENGTH:
+        return extract_intent(query)
+    return _cached_extract_intent(query)
+
+@lru_cache(maxsize=8)
+def _get_llm_tool(deepseek_api_key: str) -> IntentClassificationTool:
+    """One classification tool per API key, so its HTTP session is reused across queries."""
+    return IntentClassificationTool(deepseek_api_key=deepseek_api_key)
+
+def _get_cached_llm_intent(key: str) -> Optional[IntentType]:
+    """Return an unexpired LLM classification for a normalized query, if any."""
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, intent = entry
+        if time.monotonic() >= expires_at:
+            del _llm_cache[key]
+            return None
+        _llm_cache.move_to_end(key)
+        return intent
+
+def _store_llm_intent(key: str, intent: IntentType) -> None:
+    """Cache an LLM classification, evicting the least recently used entries."""
+    ttl = LLM_OUT_OF_SCOPE_TTL if intent == 'out_of_scope' else LLM_CACHE_TTL
+    with _llm_cache_lock:
+        _llm_cache[key] = (time.monotonic() + ttl, intent)
+        _llm_cache.move_to_end(key)
+        while len(_llm_cache) > LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
+
 def classify_intent(
     query: str, 
     use_llm_fallback: bool = True,
@@ -32,7 +89,7 @@ def classify_intent(
         The classified intent
     """
     # Step 1: Try rule-based classification first (faster and cheaper)
-    rule_based_intent = extract_intent(query)
+    rule_based_intent = _rule_based_intent(query)
     
     # If rule-based gives a conclusive result (not out_of_scope), return it
     if rule_based_intent != 'out_of_scope':
@@ -49,12 +106,22 @@ def classify_intent(
             logger.warning("No Deepseek API key available for LLM fallback classification")
             return rule_based_intent
         
+        # Retries and rephrasings that only differ in case or padding share an entry
+        cache_key = query.strip().lower()
+        cacheable = 0 < len(cache_key) <= MAX_CACHED_QUERY_LENGTH
+        if cacheable:
+            cached_intent = _get_cached_llm_intent(cache_key)
+            if cached_intent is not None:
+                logger.info(f"Cached LLM intent classification: '{query}' -> {cached_intent}")
+                return cached_intent
+        
         try:
-            # Create and use the LLM classification tool
-            llm_tool = IntentClassificationTool(deepseek_api_key=deepseek_api_key)
-            llm_intent = llm_tool._run(query)
+            # Use the shared LLM classification tool
+            llm_intent = _get_llm_tool(deepseek_api_key)._run(query)
             
             logger.info(f"LLM fallback intent classification: '{query}' -> {llm_intent}")
+            if cacheable:
+                _store_llm_intent(cache_key, llm_intent)
             return llm_intent
             
         except Exception as e:
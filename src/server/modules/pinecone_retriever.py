@@ -5,18 +5,101 @@ This module provides a unified interface for retrieving relevant documents from
 """
 
 import os
+import re
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pinecone import Pinecone, Index, ServerlessSpec, PodSpec
 from langchain_core.embeddings import Embeddings
 from langchain_pinecone import PineconeVectorStore
 from langchain_core.documents import Document
 import json
 
+# numpy powers the near-duplicate query cache; without it only exact repeats are cached
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Retrieval results are reused for ten minutes, so newly ingested documents still show up
+RESULT_CACHE_TTL = 600
+RESULT_CACHE_SIZE = 1024
+EMBEDDING_CACHE_SIZE = 1024
+
+# Recent query embeddings kept for near-duplicate matching, and the cosine similarity
+# above which a new query reuses a cached query's results
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# Part and model numbers in a normalized query: alphanumeric tokens of six or more characters
+# with a digit (e.g. ps11752778, wdt780saem1, gd5shaaxnq00); queries naming different ones
+# embed almost identically but need different documents
+_PART_OR_MODEL_PATTERN = re.compile(r"\b(?=[a-z]*\d)[a-z0-9]{6,}\b")
+
+def _normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace, so trivially different spellings share cache entries."""
+    return " ".join(query.lower().split())
+
+def _cache_key(*parts: Any) -> str:
+    """SHA-256 of the key parts; keeps keys small however long the query is."""
+    return hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+class _SemanticResultCache:
+    """
+    Ring buffer of recent unit-length query embeddings and their results.
+    A lookup returns the results of the most similar cached query with the same
+    filters, if its cosine similarity is above the threshold and it hasn't expired.
+    """
+    
+    def __init__(self, capacity: int = SEMANTIC_CACHE_SIZE, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._vectors = None  # (capacity, dimensions) float32, allocated on first add
+        self._entries: List[Tuple[float, Tuple, List[Dict]]] = []  # (expiry, filters, results)
+        self._next = 0
+    
+    @staticmethod
+    def _unit(embedding: List[float]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, embedding: List[float], filters: Tuple) -> Optional[List[Dict]]:
+        """Results of a near-duplicate cached query, or None."""
+        if not self._entries or len(embedding) != self._vectors.shape[1]:
+            return None
+        similarities = self._vectors[:len(self._entries)] @ self._unit(embedding)
+        now = time.monotonic()
+        for i in np.argsort(similarities)[::-1]:
+            if similarities[i] < self.threshold:
+                break
+            expires_at, entry_filters, results = self._entries[i]
+            if entry_filters == filters and now < expires_at:
+                return results
+        return None
+    
+    def add(self, embedding: List[float], filters: Tuple, results: List[Dict]) -> None:
+        """Remember a query's results, overwriting the oldest entry when full."""
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, len(embedding)), dtype=np.float32)
+        elif len(embedding) != self._vectors.shape[1]:
+            return
+        entry = (time.monotonic() + RESULT_CACHE_TTL, filters, results)
+        if len(self._entries) < self.capacity:
+            self._entries.append(entry)
+            slot = len(self._entries) - 1
+        else:
+            slot = self._next
+            self._entries[slot] = entry
+            self._next = (slot + 1) % self.capacity
+        self._vectors[slot] = self._unit(embedding)
+
 class PineconeRetriever:
     """
     Retriever for installation guides and diagnostic information using Pinecone vector database.
@@ -48,6 +131,11 @@ class PineconeRetriever:
         self.namespace = namespace
         self.vector_store = None
         
+        # Exact-repeat caches (LRU order) and the near-duplicate query cache
+        self._result_cache: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._embed_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._semantic_cache = _SemanticResultCache() if np is not None else None
+        
         if not self.api_key:
             logger.warning("No Pinecone API key provided. Using mock data instead.")
             self.use_mock = True
@@ -130,8 +218,25 @@ class PineconeRetriever:
                 logger.warning("No embeddings model provided, using fallback retrieval")
                 return self._fallback_retrieval(query, doc_type, appliance_type, top_k)
             
+            # Identical (normalized) queries with the same filters reuse earlier results
+            normalized_query = _normalize_query(query)
+            result_key = _cache_key(normalized_query, doc_type, appliance_type, top_k, score_threshold)
+            cached = self._get_cached_results(result_key)
+            if cached is not None:
+                return cached
+            
             # Embed the query
-            query_embedding = self.embeddings_model.embed_query(query)
+            query_embedding = self._embed_query(normalized_query, query)
+            
+            # Near-duplicate queries with the same filters and the same part/model numbers
+            # reuse earlier results too
+            part_and_model_numbers = frozenset(_PART_OR_MODEL_PATTERN.findall(normalized_query))
+            filters = (doc_type, appliance_type, top_k, score_threshold, part_and_model_numbers)
+            if self._semantic_cache is not None:
+                similar = self._semantic_cache.lookup(query_embedding, filters)
+                if similar is not None:
+                    self._store_results(result_key, similar)
+                    return [dict(doc) for doc in similar]
             
             # Build the filter for metadata
             filter_dict = {}
@@ -160,12 +265,48 @@ class PineconeRetriever:
                     }
                     documents.append(doc)
             
-            return documents
+            self._store_results(result_key, documents)
+            if self._semantic_cache is not None:
+                self._semantic_cache.add(query_embedding, filters, documents)
+            return [dict(doc) for doc in documents]
             
         except Exception as e:
             logger.error(f"Error retrieving from Pinecone: {e}")
             return self._get_mock_docs(query, doc_type, appliance_type, top_k)
     
+    def _embed_query(self, normalized_query: str, query: str) -> List[float]:
+        """Embed a query, reusing the embedding of an identical normalized query."""
+        key = _cache_key(normalized_query)
+        embedding = self._embed_cache.get(key)
+        if embedding is not None:
+            self._embed_cache.move_to_end(key)
+            return embedding
+        
+        embedding = self.embeddings_model.embed_query(query)
+        self._embed_cache[key] = embedding
+        while len(self._embed_cache) > EMBEDDING_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+        return embedding
+    
+    def _get_cached_results(self, key: str) -> Optional[List[Dict]]:
+        """Return copies of unexpired cached results for a retrieval key, if any."""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, documents = entry
+        if time.monotonic() >= expires_at:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return [dict(doc) for doc in documents]
+    
+    def _store_results(self, key: str, documents: List[Dict]) -> None:
+        """Cache retrieval results, evicting the least recently used entries."""
+        self._result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, documents)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
     def _fallback_retrieval(
         self, 
         query: str, 
@@ -5,13 +5,16 @@ import re
 import uuid
 import urllib.parse
 import random
-from typing import Dict, List, Optional, Union, Set, Any, Callable, Type, Literal, ClassVar
+from typing import Dict, List, Optional, Union, Set, Any, Callable, Type, Literal, ClassVar, Iterable
 from pymongo import MongoClient
 from pymongo.collection import Collection
 import logging
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 import asyncio
 import aiohttp
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import os
 import json
 from langchain_core.tools import BaseTool
@@ -815,6 +818,8 @@ class IntentClassificationTool:
         self.deepseek_api_key = deepseek_api_key or os.getenv("DEEPSEEK_API_KEY")
         if not self.deepseek_api_key:
             logging.warning("No Deepseek API key provided. Intent classification will not work.")
+        # Keep-alive session so repeated classifications reuse the TLS connection
+        self.http = requests.Session()
     
     def _run(self, query: str) -> str:
         """Run intent classification on a query."""
@@ -868,7 +873,7 @@ class IntentClassificationTool:
             "max_tokens": 50
         }
         
-        response = requests.post(
+        response = self.http.post(
             "https://api.deepseek.com/v1/chat/completions",
             headers=headers,
             json=data
@@ -1760,12 +1765,12 @@ class PartSelectScraper:
             logger.error(f"Error upserting part to MongoDB: {e}")
             return False
     
-    def bulk_upsert_parts(self, part_numbers: List[str]) -> Dict[str, int]:
+    def bulk_upsert_parts(self, part_numbers: Iterable[str]) -> Dict[str, int]:
         """
         Bulk upsert multiple parts by part number.
         
         Args:
-            part_numbers: List of part numbers to scrape and upsert
+            part_numbers: Part numbers to scrape and upsert; any iterable, consumed once
             
         Returns:
             Dictionary with success and failure counts
@@ -1786,6 +1791,10 @@ class PartSelectScraper:
         
         return results
 
+# Minimum seconds between any two requests to partselect.ca, shared by all crawl threads;
+# about the rate of the sequential crawler, so parallel crawls overlap parsing and storage instead
+DOC_CRAWL_MIN_INTERVAL = 2.0
+
 class DocScraper:
     """
     A web scraper for PartSelect.ca documentation pages that extracts repair instructions,
@@ -1844,8 +1853,31 @@ class DocScraper:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
         ]
         
-        # Track visited URLs to avoid duplicates
+        # Track visited URLs to avoid duplicates; the lock covers concurrent pattern crawls
         self.visited_urls: Set[str] = set()
+        self._visited_lock = threading.Lock()
+        
+        # Every request from every crawl thread takes its turn here, see DOC_CRAWL_MIN_INTERVAL
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # requests.Session isn't thread-safe, so each crawl thread keeps its own keep-alive session
+        self._local = threading.local()
+    
+    def _session(self) -> requests.Session:
+        """Return the calling thread's HTTP session, creating it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
+    def _wait_for_request_slot(self):
+        """Block until DOC_CRAWL_MIN_INTERVAL has passed since the previous request from any thread."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + DOC_CRAWL_MIN_INTERVAL
+        if wait > 0:
+            time.sleep(wait)
     
     def get_headers(self) -> Dict[str, str]:
         """
@@ -1896,8 +1928,9 @@ class DocScraper:
                 
                 # Add a random delay to mimic human behavior
                 time.sleep(random.uniform(1.0, 3.0))
+                self._wait_for_request_slot()
                 
-                response = requests.get(url, headers=headers, timeout=15)
+                response = self._session().get(url, headers=headers, timeout=15)
                 response.raise_for_status()
                 return response.text
             except requests.RequestException as e:
@@ -2049,11 +2082,12 @@ class DocScraper:
         Returns:
             Processed document data or None if failed
         """
-        if url in self.visited_urls:
-            logger.info(f"Skipping already processed URL: {url}")
-            return None
-        
-        self.visited_urls.add(url)
+        with self._visited_lock:
+            if url in self.visited_urls:
+                logger.info(f"Skipping already processed URL: {url}")
+                return None
+            
+            self.visited_urls.add(url)
         
         # Make sure URL is absolute
         if not url.startswith(('http://', 'https://')):
@@ -2205,26 +2239,31 @@ class DocScraper:
         
         return results
     
-    def bulk_process_urls(self, urls: List[str], max_per_url: int = 20) -> Dict[str, int]:
+    def bulk_process_urls(self, urls: List[str], max_per_url: int = 20, concurrency: int = 1) -> Dict[str, int]:
         """
         Bulk process multiple URL patterns.
         
         Args:
             urls: List of URLs or URL patterns to process
             max_per_url: Maximum documents to process per URL pattern
+            concurrency: Number of URL patterns crawled at the same time
             
         Returns:
             Dictionary with success and failure counts
         """
         total_results = {"success": 0, "failure": 0, "skipped": 0}
         
-        for url in urls:
+        def crawl(url: str) -> Dict[str, int]:
             logger.info(f"Processing URL pattern: {url}")
-            results = self.crawl_url_pattern(url, max_per_url)
-            
-            total_results["success"] += results["success"]
-            total_results["failure"] += results["failure"]
-            total_results["skipped"] += results["skipped"]
+            return self.crawl_url_pattern(url, max_per_url)
+        
+        # Patterns are independent, so crawl them in parallel threads; their requests
+        # still share one rate limit (see DOC_CRAWL_MIN_INTERVAL)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for results in executor.map(crawl, urls):
+                total_results["success"] += results["success"]
+                total_results["failure"] += results["failure"]
+                total_results["skipped"] += results["skipped"]
         
         return total_results
 
@@ -2236,17 +2275,18 @@ class CartTool(BaseTool):
     name: ClassVar[str] = "cart_tool"
     description: ClassVar[str] = "Manage shopping cart operations: add items, remove items, or view the cart"
     
-    def __init__(self, catalog_client=None, redis_url="redis://localhost:6379/0", **kwargs):
+    def __init__(self, catalog_client=None, redis_url="redis://localhost:6379/0", redis_client=None, **kwargs):
         """
         Initialize the cart tool with Redis connection and catalog client for product details.
         
         Args:
             catalog_client: An instance of CatalogClient or AsyncCatalogClient
             redis_url: URL for Redis connection
+            redis_client: Existing Redis client (e.g. on a shared connection pool); overrides redis_url
         """
         super().__init__(**kwargs)
         self.catalog_client = catalog_client
-        self.redis_client = redis.from_url(redis_url)
+        self.redis_client = redis_client or redis.from_url(redis_url)
         
     async def _run_async(
         self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
@@ -2419,7 +2459,8 @@ class OrderStatusTool(BaseTool):
     name: ClassVar[str] = "order_status_tool"
     description: ClassVar[str] = "Check the status of an order by order number or email"
     
-    def __init__(self, api_base_url="https://api.partselect.com/v1", api_key=None, use_mock=True, **kwargs):
+    def __init__(self, api_base_url="https://api.partselect.com/v1", api_key=None, use_mock=True,
+                 get_session=None, **kwargs):
         """
         Initialize the order status tool with API connection details.
         
@@ -2427,11 +2468,14 @@ class OrderStatusTool(BaseTool):
             api_base_url: Base URL for the PartSelect API
             api_key: API key for authentication
             use_mock: Whether to use mock data (for testing)
+            get_session: Callable returning a shared aiohttp.ClientSession; without it
+                         each request opens its own session
         """
         super().__init__(**kwargs)
         self.api_base_url = api_base_url
         self.api_key = api_key
         self.use_mock = use_mock
+        self.get_session = get_session
         self.mock_orders = self._initialize_mock_orders()
     
     def _initialize_mock_orders(self) -> Dict[str, Dict]:
@@ -2553,8 +2597,9 @@ class OrderStatusTool(BaseTool):
             else:
                 url = f"{self.api_base_url}/orders/{query}"
             
-            # Make async request
-            async with aiohttp.ClientSession() as session:
+            # Make async request, reusing the shared session's connection pool if there is one
+            shared_session = self.get_session() if self.get_session else None
+            async with (nullcontext(shared_session) if shared_session else aiohttp.ClientSession()) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -46,6 +46,11 @@ agent = PartSelectAgent(
     redis_url=os.getenv("REDIS_URL", "redis://localhost:6379/0")
 )
 
+@app.on_event("shutdown")
+async def close_agent():
+    """Release the agent's shared connection pools."""
+    await agent.aclose()
+
 # Connection manager for WebSockets
 class ConnectionManager:
     def __init__(self):
@@ -76,6 +81,78 @@ class ConnectionManager:
 # Create connection manager instance
 manager = ConnectionManager()
 
+# Progress text shown while the tool for each intent runs
+INTENT_PROGRESS_MESSAGES: Dict[str, str] = {
+    "lookup": "Looking up the part...",
+    "compatibility": "Checking compatibility...",
+    "install": "Finding installation steps...",
+    "diagnose": "Diagnosing the problem...",
+    "cart": "Updating your cart...",
+    "order": "Checking your order...",
+    "multi_intent": "Working on each of your requests..."
+}
+
+def progress_frame(event: Dict) -> Dict:
+    """Client frame for an intent or ack event from PartSelectAgent.process_query_stream."""
+    frame = {"type": "progress", "stage": event["type"]}
+    if event["type"] == "intent":
+        frame["intent"] = event["intent"]
+        frame["message"] = INTENT_PROGRESS_MESSAGES.get(event["intent"], "Working on it...")
+    else:
+        frame["tool"] = event["tool"]
+    return frame
+
+def format_response(result: Dict) -> Dict:
+    """Client frame for the agent's final tool name, result and follow-up."""
+    tool_name = result.get("tool_name", "unknown")
+    result_content = result.get("result", "")
+    follow_up = result.get("follow_up")
+    
+    # Try to parse result content if it's a JSON string
+    try:
+        result_data = json.loads(result_content) if isinstance(result_content, str) else result_content
+    except json.JSONDecodeError:
+        result_data = {"text": result_content}
+    
+    # Create suggested actions from follow-up
+    suggested_actions = []
+    if follow_up:
+        suggested_actions.append(follow_up)
+    
+    # Add default actions based on intent
+    if tool_name == "product_lookup_tool":
+        suggested_actions.extend([
+            "Is this compatible with my refrigerator?",
+            "How do I install this?",
+            "Add to cart"
+        ])
+    elif tool_name == "error_diagnosis_tool":
+        suggested_actions.extend([
+            "Find replacement parts",
+            "Installation instructions"
+        ])
+    elif tool_name == "cart_tool":
+        suggested_actions.extend([
+            "Continue shopping",
+            "Checkout",
+            "Clear cart"
+        ])
+    elif tool_name == "out_of_scope":
+        suggested_actions = [
+            "I need a water filter for my refrigerator",
+            "Installation Help",
+            "Order Status"
+        ]
+    
+    # Create client-friendly response format
+    return {
+        "type": "response",
+        "message": result_content,
+        "tool_used": tool_name,
+        "data": result_data if isinstance(result_data, dict) else {},
+        "suggested_actions": suggested_actions
+    }
+
 # Define WebSocket endpoint
 @app.websocket("/chat")
 async def websocket_endpoint(websocket: WebSocket):
@@ -87,62 +164,21 @@ async def websocket_endpoint(websocket: WebSocket):
             logger.info(f"Received message: {message}")
 
             try:
-                # Process with PartSelectAgent
-                result = await agent.process_query(message)
-                
-                # Format response for the client
-                tool_name = result.get("tool_name", "unknown")
-                result_content = result.get("result", "")
-                follow_up = result.get("follow_up")
+                # Stream progress frames while the agent works; the final frame is the full response
+                result = {}
+                async for event in agent.process_query_stream(message):
+                    if event["type"] in ("intent", "ack"):
+                        await manager.send_message(json.dumps(progress_frame(event)), websocket)
+                    else:
+                        result.update((key, value) for key, value in event.items() if key != "type")
                 
-                # Try to parse result content if it's a JSON string
-                try:
-                    result_data = json.loads(result_content) if isinstance(result_content, str) else result_content
-                except json.JSONDecodeError:
-                    result_data = {"text": result_content}
-                
-                # Create suggested actions from follow-up
-                suggested_actions = []
-                if follow_up:
-                    suggested_actions.append(follow_up)
-                
-                # Add default actions based on intent
-                if tool_name == "product_lookup_tool":
-                    suggested_actions.extend([
-                        "Is this compatible with my refrigerator?",
-                        "How do I install this?",
-                        "Add to cart"
-                    ])
-                elif tool_name == "error_diagnosis_tool":
-                    suggested_actions.extend([
-                        "Find replacement parts",
-                        "Installation instructions"
-                    ])
-                elif tool_name == "cart_tool":
-                    suggested_actions.extend([
-                        "Continue shopping",
-                        "Checkout",
-                        "Clear cart"
-                    ])
-                elif tool_name == "out_of_scope":
-                    suggested_actions = [
-                        "I need a water filter for my refrigerator",
-                        "Installation Help",
-                        "Order Status"
-                    ]
-                
-                # Create client-friendly response format
-                response = {
-                    "message": result_content,
-                    "tool_used": tool_name,
-                    "data": result_data if isinstance(result_data, dict) else {},
-                    "suggested_actions": suggested_actions
-                }
+                response = format_response(result)
                 
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 # Fallback response
                 response = {
+                    "type": "response",
                     "message": "I'm sorry, I encountered an error processing your request. Please try again.",
                     "tool_used": "error",
                     "data": {},
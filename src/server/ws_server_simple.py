@@ -26,8 +26,13 @@ logger = logging.getLogger(__name__)
 # Create FastAPI app
 app = FastAPI(title="PartSelect Chat API")
 
-# Add health endpoint router
-app.include_router(health_router)
+# Add readiness endpoint router at /health/ready
+app.include_router(health_router, prefix="/health")
+
+@app.get("/health")
+async def health_check():
+    """Liveness check: the process is up; dependencies are checked by /health/ready."""
+    return {"status": "ok"}
 
 # Add CORS middleware with explicit configuration
 app.add_middleware(
@@ -3,15 +3,26 @@
 Test script for the enhanced MockDataProvider with additional parts and documentation.
 """
 
+import gc
 import sys
 import os
+import weakref
 from pprint import pprint
 
 # Add the server directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src', 'server'))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'server'))
 
+from modules import mock_data
 from modules.mock_data import MockDataProvider
 
+# Queries for comparing the indexed searches with a scan of every record: whole words,
+# partial words, tokens shorter than a trigram, phrases, stopwords and text spanning fields
+SEARCH_QUERIES = (
+    "water filter", "filter", "ilte", "ice maker", "ice", "ic", "pump", "drain pump",
+    "door", "seal", "gasket", "leak", "not", "the", "ps117", "w10", "ter fil",
+    "clean", "noise", "heating element", "spray arm", "xyzzy", "of the", "e, th"
+)
+
 def test_part_catalog():
     """Test the part catalog functionality of the MockDataProvider."""
     provider = MockDataProvider()
@@ -101,6 +112,228 @@ def test_documentation():
     for note in safety_notes:
         print(f"  {note}")
 
+# Outputs of the original list-scanning provider for a fixed set of calls;
+# parts are compared by part number and docs by title
+BASELINE_PART_RESULTS = (
+    ("search_parts", ("water filter",), ["PS11761591"]),
+    ("search_parts", ("water filter", "refrigerator", 3), ["PS11761591"]),
+    ("search_parts", ("filter", "dishwasher"), []),
+    ("search_parts", ("Pump",), ["PS11748915", "PS11743427", "PS11778432"]),
+    ("search_parts", ("door", None, 2), ["PS11787619", "PS11782143"]),
+    ("search_parts", ("ice maker", "dishwasher"), []),
+    ("search_parts", ("ps117",), [
+        "PS11746337", "PS11752778", "PS11722167", "PS11705149", "PS11703459",
+        "PS11787619", "PS11784756", "PS11761591", "PS11748915", "PS11792457"
+    ]),
+    ("search_parts", ("xyzzy",), []),
+    ("search_parts", ("seal", None, 0), []),
+    ("find_compatible_parts", ("WDT750SAHZ",), [
+        "PS11743427", "PS11756393", "PS11723171", "PS11708155", "PS11769123",
+        "PS11763814", "PS11754921", "PS11742639", "PS11778432", "PS11749673"
+    ]),
+    ("find_compatible_parts", ("wdt750sahz", 2), ["PS11743427", "PS11756393"]),
+    ("find_compatible_parts", ("WRS325FDAM04",), []),
+    ("get_popular_parts", ("refrigerator", 3), ["PS11746337", "PS11752778", "PS11722167"]),
+    ("get_popular_parts", ("Dishwasher",), ["PS11743427", "PS11756393", "PS11723171", "PS11708155", "PS11769123"]),
+    ("get_popular_parts", ("microwave",), []),
+)
+BASELINE_DOC_RESULTS = (
+    ("search_docs", ("ice maker", "troubleshooting", None, 2), ["Refrigerator Ice Maker Troubleshooting"]),
+    ("search_docs", ("ice maker",), [
+        "Refrigerator Ice Maker Troubleshooting", "How to Replace a Refrigerator Ice Maker Assembly"
+    ]),
+    ("search_docs", ("install", None, "dishwasher"), [
+        "Dishwasher Not Draining Troubleshooting Guide", "How to Replace a Dishwasher Door Seal",
+        "How to Install a Dishwasher Heating Element", "Dishwasher Spray Arm Troubleshooting and Replacement",
+        "Dishwasher Control Board Replacement Guide"
+    ]),
+    ("search_docs", ("leak", None, None, 10), [
+        "Refrigerator Ice Maker Troubleshooting", "Dishwasher Not Draining Troubleshooting Guide",
+        "How to Replace a Dishwasher Door Seal", "How to Install a Dishwasher Heating Element",
+        "How to Replace a Refrigerator Ice Maker Assembly", "Dishwasher Spray Arm Troubleshooting and Replacement",
+        "Refrigerator Compressor Troubleshooting Guide", "Safety Guidelines for Appliance Repair"
+    ]),
+    ("search_docs", ("Water", None, "refrigerator", 3), [
+        "How to Replace a Refrigerator Water Filter", "Refrigerator Ice Maker Troubleshooting",
+        "How to Replace a Refrigerator Ice Maker Assembly"
+    ]),
+    ("search_docs", ("xyzzy",), []),
+    ("get_installation_docs", ("door seal", "dishwasher"), ["How to Replace a Dishwasher Door Seal"]),
+    ("get_installation_docs", (), [
+        "How to Replace a Refrigerator Water Filter", "How to Replace a Dishwasher Door Seal",
+        "How to Install a Dishwasher Heating Element", "How to Replace a Refrigerator Ice Maker Assembly",
+        "Dishwasher Spray Arm Troubleshooting and Replacement"
+    ]),
+    ("get_installation_docs", (None, "refrigerator", 2), [
+        "How to Replace a Refrigerator Water Filter", "How to Replace a Refrigerator Ice Maker Assembly"
+    ]),
+    ("get_installation_docs", ("Water Filter",), ["How to Replace a Refrigerator Water Filter"]),
+    ("get_installation_docs", ("xyzzy",), []),
+    ("get_troubleshooting_docs", ("draining", "dishwasher"), ["Dishwasher Not Draining Troubleshooting Guide"]),
+    ("get_troubleshooting_docs", (), [
+        "Refrigerator Ice Maker Troubleshooting", "Dishwasher Not Draining Troubleshooting Guide",
+        "Refrigerator Temperature Troubleshooting", "Refrigerator Compressor Troubleshooting Guide"
+    ]),
+    ("get_troubleshooting_docs", ("not", None, 2), [
+        "Refrigerator Ice Maker Troubleshooting", "Dishwasher Not Draining Troubleshooting Guide"
+    ]),
+    ("get_troubleshooting_docs", ("ICE", "refrigerator"), ["Refrigerator Ice Maker Troubleshooting"]),
+    ("get_troubleshooting_docs", ("xyzzy",), []),
+)
+BASELINE_WATER_FILTER_STEPS = [
+    "1. Locate your water filter inside the refrigerator, typically in the upper right corner of the fresh food section or in the base grille.",
+    "2. If your filter is in the interior, push the button next to the filter to release it.",
+    "3. Pull the old filter straight out and remove it completely.",
+    "4. Remove the protective cap from the new filter.",
+    "5. Insert the new filter into the same location, pushing until it clicks into place.",
+    "6. Run 2-3 gallons of water through the dispenser to clear the system and remove any carbon residue."
+]
+BASELINE_SAFETY_NOTES = [
+    "Electrical Safety",
+    "ALWAYS disconnect power before repairs",
+    "Gas Appliance Safety",
+    "If you smell gas, evacuate and call from a safe location",
+    "Water-Connected Appliance Safety"
+]
+
+def test_public_methods_match_baseline_outputs():
+    """The indexed provider returns what the original list-scanning provider did, in the same order."""
+    provider = MockDataProvider()
+    
+    for method, args, expected in BASELINE_PART_RESULTS:
+        assert [part["partNumber"] for part in getattr(provider, method)(*args)] == expected, (method, args)
+    for method, args, expected in BASELINE_DOC_RESULTS:
+        assert [doc["title"] for doc in getattr(provider, method)(*args)] == expected, (method, args)
+    
+    assert len(provider.get_all_parts()) == 30
+    assert provider.get_part_by_number("PS11743427")["partNumber"] == "PS11743427"
+    assert provider.get_part_by_number("W10295370A") is None
+    assert provider.is_part_compatible("PS11743427", "WDT750SAHZ")
+    assert provider.is_part_compatible("PS11743427", "wdt750sahz")
+    assert not provider.is_part_compatible("PS11743427", "WRS325FDAM04")
+    assert not provider.is_part_compatible("PS0000000", "WDT750SAHZ")
+    title = "How to Replace a Refrigerator Water Filter"
+    assert provider.get_doc_by_title(title.lower())["title"] == title
+    assert provider.get_doc_by_title("No Such Doc") is None
+    
+    assert provider.get_repair_steps("water filter") == BASELINE_WATER_FILTER_STEPS
+    door_seal_steps = provider.get_repair_steps("Door Seal", "dishwasher")
+    assert len(door_seal_steps) == 10
+    assert door_seal_steps[-1] == "10. Work your way around the door, ensuring the seal is fully seated in the channel."
+    assert provider.get_repair_steps("Heating Element", "dishwasher") == []
+    assert provider.get_repair_steps("flux capacitor") == list(mock_data.GENERIC_REPAIR_STEPS)
+    assert provider.get_safety_notes() == BASELINE_SAFETY_NOTES
+
+def test_indexed_searches_match_a_linear_scan():
+    """The token index never drops or adds a match compared with checking every record."""
+    provider = MockDataProvider()
+    parts = provider.get_all_parts()
+    docs = provider.docs
+    
+    for query in SEARCH_QUERIES:
+        needle = query.lower()
+        expected_parts = [
+            part for part in parts
+            if needle in part["name"].lower() or needle in part["description"].lower()
+            or needle in part["partNumber"].lower()
+        ]
+        expected_docs = [doc for doc in docs if needle in doc["title"].lower() or needle in doc["content"].lower()]
+        expected_troubleshooting = [doc for doc in expected_docs if doc["type"] == "troubleshooting"]
+        
+        assert provider.search_parts(query, limit=len(parts)) == expected_parts, query
+        assert provider.search_docs(query, limit=len(docs)) == expected_docs, query
+        assert provider.get_troubleshooting_docs(query, limit=len(docs)) == expected_troubleshooting, query
+
+def test_token_index_finds_tokens_containing_a_query_token():
+    """Containing lookups agree with checking every indexed token, for short and long query tokens."""
+    index = mock_data._TokenIndex(["water filter\0replacement", "ice maker", "drain pump\0filter housing"])
+    
+    for token in ("filter", "ilt", "ter", "er", "i", "pump", "housings", "xyz"):
+        expected = {
+            i for indexed_token, positions in index.postings.items()
+            if token in indexed_token for i in positions
+        }
+        assert index.containing(token) == expected, token
+
+def test_popular_parts_come_from_the_appliance_view():
+    """Popular parts are the first parts of that appliance's catalog, whatever the case of its name."""
+    provider = MockDataProvider()
+    
+    assert provider.get_popular_parts("refrigerator", limit=3) == mock_data.REFRIGERATOR_PARTS[:3]
+    assert provider.get_popular_parts("Dishwasher") == mock_data.DISHWASHER_PARTS[:5]
+    assert provider.get_popular_parts("dishwasher", limit=100) == mock_data.DISHWASHER_PARTS
+    assert provider.get_popular_parts("microwave") == []
+
+def test_part_number_prefix_lookup():
+    """Part number prefixes match case-insensitively, in part number order, up to the limit."""
+    provider = MockDataProvider()
+    numbers = lambda parts: [part["partNumber"] for part in parts]
+    
+    expected = ["PS11742639", "PS11743427", "PS11746337", "PS11748915", "PS11749673"]
+    assert numbers(provider.search_parts_by_prefix("PS1174")) == expected
+    assert numbers(provider.search_parts_by_prefix(" ps1174 ")) == expected
+    assert numbers(provider.search_parts_by_prefix("ps1174", limit=2)) == expected[:2]
+    assert numbers(provider.search_parts_by_prefix("PS11743427")) == ["PS11743427"]
+    assert numbers(provider.search_parts_by_prefix("PS", limit=100)) == sorted(numbers(provider.get_all_parts()))
+    assert provider.search_parts_by_prefix("ps1174", limit=0) == []
+    assert provider.search_parts_by_prefix("") == []
+    assert provider.search_parts_by_prefix("   ") == []
+    assert provider.search_parts_by_prefix("PS9") == []
+    assert provider.search_parts_by_prefix("ZZZ") == []
+
+def test_model_number_prefix_lookup():
+    """Model number prefixes match case-insensitively, in model number order, up to the limit."""
+    provider = MockDataProvider()
+    
+    expected = ["WDT730PAHZ", "WDT750SAHZ", "WDT780SAEM1", "WDT970SAHZ"]
+    assert provider.find_models_by_prefix("WDT") == expected
+    assert provider.find_models_by_prefix("wdt") == expected
+    assert provider.find_models_by_prefix("wdt", limit=3) == expected[:3]
+    assert provider.find_models_by_prefix("WDT750SAHZ") == ["WDT750SAHZ"]
+    assert provider.find_models_by_prefix("wdt", limit=0) == []
+    assert provider.find_models_by_prefix("") == []
+    assert provider.find_models_by_prefix("WDX") == []
+    assert provider.find_models_by_prefix("ZZZ") == []
+    # Every returned model finds compatible parts
+    for model in provider.find_models_by_prefix("W", limit=100):
+        assert provider.find_compatible_parts(model), model
+
+def test_cached_results_are_isolated_copies():
+    """Mutating a cached search result changes neither the next result nor the catalog."""
+    provider = MockDataProvider()
+    
+    first = provider.search_parts("water filter")
+    first[0]["name"] = "Changed"
+    first[0]["compatibleModels"] = ()
+    first.append({"partNumber": "PS0000000"})
+    second = provider.search_parts("water filter")
+    
+    assert [part["partNumber"] for part in second] == ["PS11761591"]
+    assert second[0]["name"] != "Changed" and second[0]["compatibleModels"]
+    assert provider.get_part_by_number("PS11761591")["name"] == second[0]["name"]
+    
+    docs = provider.get_troubleshooting_docs(["ice", "leak"])
+    docs[0]["title"] = "Changed"
+    assert provider.get_troubleshooting_docs(["ice", "leak"])[0]["title"] != "Changed"
+    assert provider.search_parts.cache_info().hits == 1
+
+def test_search_caches_are_per_provider():
+    """Each provider has its own caches, which are freed along with it."""
+    first, second = MockDataProvider(), MockDataProvider()
+    
+    first.search_docs("ice maker")
+    second.search_docs("ice maker")
+    assert first.search_docs.cache_info().misses == second.search_docs.cache_info().misses == 1
+    
+    first.search_docs.cache_clear()
+    assert first.search_docs.cache_info().currsize == 0
+    assert second.search_docs.cache_info().currsize == 1
+    
+    provider = weakref.ref(first)
+    del first
+    gc.collect()
+    assert provider() is None
+
 if __name__ == "__main__":
     test_part_catalog()
     test_documentation()
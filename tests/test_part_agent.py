@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tests for the PartSelectAgent tool result cache, compound query splitting and response stream.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the repository root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.agents import part_agent
+from src.server.agents.part_agent import ConversationContext, PartSelectAgent
+
+class FakeCache:
+    """In-memory stand-in for the async Redis client, recording the TTL of each entry."""
+
+    def __init__(self, fail=False):
+        self.entries = {}
+        self.ttls = {}
+        self.gets = 0
+        self.fail = fail
+        self.closed = False
+
+    async def get(self, key):
+        self.gets += 1
+        if self.fail:
+            raise ConnectionError("redis is down")
+        return self.entries.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.entries[key] = value
+        self.ttls[key] = ex
+
+    async def close(self):
+        self.closed = True
+
+class CountingTool:
+    """Tool that returns a fixed result and counts its runs."""
+
+    def __init__(self, result="Fits: Water Filter (Part #W10295370A) is compatible with model WRS325FDAM04."):
+        self.name = "counting_tool"
+        self.result = result
+        self.calls = 0
+
+    async def _arun(self, query):
+        self.calls += 1
+        return self.result
+
+def _agent(cache):
+    """An agent with only the response cache set; the tools under test are passed in directly."""
+    agent = PartSelectAgent.__new__(PartSelectAgent)
+    agent.response_cache = cache
+    return agent
+
+def test_cache_miss_runs_tool_then_hit_reuses_result():
+    """The first call runs the tool and stores its result; the second is served from the cache."""
+    cache = FakeCache()
+    agent = _agent(cache)
+    tool = CountingTool()
+
+    first = asyncio.run(agent._cached_run_tool("compatibility", tool, "W10295370A:WRS325FDAM04"))
+    second = asyncio.run(agent._cached_run_tool("compatibility", tool, "W10295370A:WRS325FDAM04"))
+
+    assert first == second == tool.result
+    assert tool.calls == 1
+    assert list(cache.ttls.values()) == [part_agent.RESPONSE_CACHE_TTL]
+
+def test_error_and_not_found_results_expire_quickly():
+    """Error strings the tools return instead of raising are only cached briefly."""
+    for result in (
+        '{"error": "Part PS0000000 not found"}',
+        "Error checking compatibility: connection refused",
+        "No troubleshooting information found for 'noise'."
+    ):
+        cache = FakeCache()
+        asyncio.run(_agent(cache)._cached_run_tool("lookup", CountingTool(result), "PS0000000"))
+        assert list(cache.ttls.values()) == [part_agent.RESPONSE_ERROR_TTL]
+
+def test_cart_and_order_intents_are_not_cached():
+    """Live cart and order state always goes to the tool."""
+    cache = FakeCache()
+    agent = _agent(cache)
+    tool = CountingTool('{"items": []}')
+
+    for intent in ("cart", "order"):
+        asyncio.run(agent._cached_run_tool(intent, tool, "view"))
+        asyncio.run(agent._cached_run_tool(intent, tool, "view"))
+
+    assert tool.calls == 4
+    assert cache.gets == 0
+    assert cache.entries == {}
+
+def test_redis_error_fails_open_and_closes_cache():
+    """A Redis error still returns the tool result, then disables and closes the cache."""
+    cache = FakeCache(fail=True)
+    agent = _agent(cache)
+    tool = CountingTool()
+
+    result = asyncio.run(agent._cached_run_tool("lookup", tool, "W10295370A"))
+
+    assert result == tool.result
+    assert tool.calls == 1
+    assert agent.response_cache is None
+    assert cache.closed
+
+def _routing_agent():
+    """An agent with only the intent-to-tool map, for checking how queries are split."""
+    agent = PartSelectAgent.__new__(PartSelectAgent)
+    agent.intent_tool_map = dict.fromkeys(["lookup", "compatibility", "install", "diagnose", "cart", "order"])
+    return agent
+
+def test_compound_queries_split_into_independent_requests():
+    """Clauses that each open with their own request cue run as separate intents."""
+    agent = _routing_agent()
+
+    assert agent._extract_multi_intent("Check order 12345 and add W10295370A to cart") == [
+        ("order", "Check order 12345"),
+        ("cart", "add W10295370A to cart"),
+    ]
+    assert agent._extract_multi_intent(
+        "Is part PS11752778 compatible with WDT780SAEM1 and how do I install it in my dishwasher?"
+    ) == [
+        ("compatibility", "Is part PS11752778 compatible with WDT780SAEM1"),
+        ("install", "how do I install it in my dishwasher?"),
+    ]
+    assert agent._extract_multi_intent("Why is my dishwasher leaking; find a door gasket for it") == [
+        ("diagnose", "Why is my dishwasher leaking"),
+        ("lookup", "find a door gasket for it"),
+    ]
+
+def test_single_intent_and_phrasings_are_not_split():
+    """An "and" joining objects or descriptions of one request leaves the query whole."""
+    agent = _routing_agent()
+
+    for query in (
+        "How do I install the water filter and the ice maker in my refrigerator?",
+        "My refrigerator ice maker is not working and the water filter part PS11752778 needs replacing",
+        "Find the drain pump and the door gasket for my dishwasher",
+        "I need to find and install a water filter",
+        "Find a water filter and find an ice maker for my fridge",
+    ):
+        assert agent._extract_multi_intent(query) == [], query
+
+def _streaming_agent():
+    """An agent whose tools all return canned results, with no cache or LLM."""
+    agent = _routing_agent()
+    agent.response_cache = None
+    agent.intent_classification_tool = None
+    agent.conversation_context = ConversationContext()
+    agent.intent_tool_map = {
+        "compatibility": CountingTool(),
+        "order": CountingTool("Order 12345: shipped"),
+        "cart": CountingTool("Added W10295370A to your cart"),
+    }
+    for intent, tool in agent.intent_tool_map.items():
+        tool.name = f"{intent}_tool"
+    agent._intent_handlers = {
+        "compatibility": agent._compatibility_query,
+        "order": agent._order_query,
+        "cart": agent._cart_query,
+    }
+    return agent
+
+def _collect(agent, query):
+    async def collect():
+        return [event async for event in agent.process_query_stream(query)]
+    return asyncio.run(collect())
+
+def test_stream_yields_intent_ack_result_then_follow_up():
+    """The intent and tool are announced before the tool result and its follow-up."""
+    agent = _streaming_agent()
+
+    events = _collect(agent, "Is part PS11752778 compatible with WDT780SAEM1?")
+
+    assert events == [
+        {"type": "intent", "intent": "compatibility"},
+        {"type": "ack", "tool": "compatibility_tool"},
+        {"type": "result", "tool_name": "compatibility_tool", "result": CountingTool().result},
+        {"type": "follow_up", "follow_up": "Would you like to see installation instructions for this part?"},
+    ]
+    assert agent.conversation_context.last_intent == "compatibility"
+
+def test_stream_compound_query_announces_every_intent():
+    """A compound query yields one multi-intent announcement and a combined result."""
+    events = _collect(_streaming_agent(), "Check order 12345 and add W10295370A to cart")
+
+    assert [event["type"] for event in events] == ["intent", "result", "follow_up"]
+    assert events[0] == {"type": "intent", "intent": "multi_intent", "intents": ["order", "cart"]}
+    assert events[1]["tool_name"] == "multi_intent"
+    assert events[1]["result"] == "Order status:\nOrder 12345: shipped\n\nCart:\nAdded W10295370A to your cart"
+
+def test_stream_out_of_scope_query_skips_progress_events():
+    """Out-of-scope queries go straight to the canned answer."""
+    events = _collect(_streaming_agent(), "What's the weather today?")
+
+    assert [event["type"] for event in events] == ["result", "follow_up"]
+    assert events[0]["tool_name"] == "out_of_scope"
+
+def test_process_query_merges_stream_into_one_response():
+    """process_query returns the result and follow-up events as one dict."""
+    response = asyncio.run(_streaming_agent().process_query("Is part PS11752778 compatible with WDT780SAEM1?"))
+
+    assert response == {
+        "tool_name": "compatibility_tool",
+        "result": CountingTool().result,
+        "follow_up": "Would you like to see installation instructions for this part?",
+    }
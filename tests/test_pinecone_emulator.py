@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Tests for the Pinecone emulator query and upsert endpoints.
+"""
+
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the repository root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pinecone_emulator
+
+client = TestClient(pinecone_emulator.app)
+
+def _create_index(name, dimension=4, **kwargs):
+    """Create a fresh index, dropping any leftover from a previous test."""
+    client.delete(f"/indexes/{name}")
+    response = client.post("/indexes", json={"name": name, "dimension": dimension, **kwargs})
+    assert response.status_code == 200
+
+def _upsert(name, vectors, namespace="default"):
+    response = client.post(
+        "/vectors/upsert",
+        params={"index_name": name},
+        json={"vectors": vectors, "namespace": namespace}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def _query(name, vector, **kwargs):
+    response = client.post(
+        "/query",
+        params={"index_name": name},
+        json={"vector": vector, **kwargs}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def test_query_ranks_by_cosine_similarity():
+    """Matches come back ordered by cosine similarity, limited to top_k."""
+    _create_index("test-rank")
+    _upsert("test-rank", [
+        {"id": "a", "values": [1, 0, 0, 0], "metadata": {"doc_type": "installation"}},
+        {"id": "b", "values": [1, 1, 0, 0], "metadata": {"doc_type": "troubleshooting"}},
+        {"id": "c", "values": [0, 0, 1, 0], "metadata": {"doc_type": "installation"}},
+    ])
+
+    result = _query("test-rank", [2, 0, 0, 0], top_k=2)
+
+    assert [m["id"] for m in result["matches"]] == ["a", "b"]
+    assert np.isclose(result["matches"][0]["score"], 1.0)
+    assert np.isclose(result["matches"][1]["score"], 1 / np.sqrt(2))
+
+def test_query_applies_metadata_filter():
+    """Filtered-out vectors never appear, even when top_k exceeds the candidates."""
+    _create_index("test-filter")
+    _upsert("test-filter", [
+        {"id": "a", "values": [1, 0, 0, 0], "metadata": {"doc_type": "installation"}},
+        {"id": "b", "values": [1, 1, 0, 0], "metadata": {"doc_type": "troubleshooting"}},
+        {"id": "c", "values": [0, 0, 1, 0], "metadata": {"doc_type": "installation"}},
+    ])
+
+    result = _query("test-filter", [1, 1, 0, 0], top_k=10, filter={"doc_type": "installation"})
+
+    assert [m["id"] for m in result["matches"]] == ["a", "c"]
+
+def test_upsert_overwrites_and_refreshes_scores():
+    """Re-upserting an id replaces its values for subsequent queries."""
+    _create_index("test-overwrite")
+    _upsert("test-overwrite", [{"id": "a", "values": [1, 0, 0, 0]}])
+    assert np.isclose(_query("test-overwrite", [1, 0, 0, 0])["matches"][0]["score"], 1.0)
+
+    _upsert("test-overwrite", [{"id": "a", "values": [0, 1, 0, 0]}])
+    result = _query("test-overwrite", [1, 0, 0, 0])
+
+    assert len(result["matches"]) == 1
+    assert np.isclose(result["matches"][0]["score"], 0.0)
+
+def test_query_unknown_namespace_returns_no_matches():
+    _create_index("test-empty")
+
+    result = _query("test-empty", [1, 0, 0, 0], namespace="missing")
+
+    assert result == {"matches": [], "namespace": "missing"}
+
+def test_delete_keeps_remaining_rows_queryable():
+    """Deleting a middle row moves the last row into its slot without losing data."""
+    _create_index("test-delete")
+    _upsert("test-delete", [
+        {"id": "a", "values": [1, 0, 0, 0]},
+        {"id": "b", "values": [0, 1, 0, 0]},
+        {"id": "c", "values": [0, 0, 1, 0], "metadata": {"tag": "last"}},
+    ])
+
+    response = client.post(
+        "/vectors/delete",
+        params={"index_name": "test-delete"},
+        json={"ids": ["a", "missing"]}
+    )
+    assert response.json() == {"deleted_count": 1}
+
+    result = _query("test-delete", [0, 0, 1, 0], top_k=5, include_values=True)
+    assert [m["id"] for m in result["matches"]] == ["c", "b"]
+    assert result["matches"][0]["metadata"] == {"tag": "last"}
+    assert result["matches"][0]["values"] == [0, 0, 1, 0]
+
+def test_sq8_index_rescores_with_exact_scores():
+    """Quantized indexes rank with int8 codes but report fp32 cosine scores."""
+    _create_index("test-sq8", dimension=16, quantization="sq8")
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 16)).astype(np.float32)
+    _upsert("test-sq8", [{"id": str(i), "values": v.tolist()} for i, v in enumerate(values)])
+
+    query = values[7] + 0.01
+    result = _query("test-sq8", query.tolist(), top_k=3)
+
+    unit = values / np.linalg.norm(values, axis=1, keepdims=True)
+    expected = unit @ (query / np.linalg.norm(query))
+    assert result["matches"][0]["id"] == "7"
+    assert np.isclose(result["matches"][0]["score"], expected[7], atol=1e-5)
+
+def test_sq8_numpy_fallback_scores_in_blocks(monkeypatch):
+    """Without SimSIMD, SQ8 scores are computed block by block and match a full pass."""
+    monkeypatch.setattr(pinecone_emulator, "simsimd", None)
+    monkeypatch.setattr(pinecone_emulator, "SCAN_BLOCK_BYTES", 256)
+    rng = np.random.default_rng(6)
+    store = pinecone_emulator.Namespace(16, quantization="sq8")
+    store.upsert_batch([str(i) for i in range(70)], rng.normal(size=(70, 16)).astype(np.float32), [{}] * 70)
+    query = rng.normal(size=16).astype(np.float32)
+    query /= np.linalg.norm(query)
+
+    scores = store.quantized_scores(query)
+
+    expected = (store.codes[:70].astype(np.float32) @ query) * store.scales[:70]
+    assert np.allclose(scores, expected, atol=1e-5)
+    assert np.allclose(scores, store.normalized() @ query, atol=0.05)
+
+def test_large_namespace_query_finds_nearest_vector():
+    """Namespaces above the HNSW threshold still return the nearest vector first."""
+    _create_index("test-large", dimension=8)
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(pinecone_emulator.HNSW_MIN_VECTORS + 200, 8)).astype(np.float32)
+    _upsert("test-large", [
+        {"id": str(i), "values": v.tolist(), "metadata": {"even": i % 2 == 0}}
+        for i, v in enumerate(values)
+    ])
+
+    result = _query("test-large", values[42].tolist(), top_k=5)
+    assert result["matches"][0]["id"] == "42"
+    assert np.isclose(result["matches"][0]["score"], 1.0, atol=1e-5)
+
+    result = _query("test-large", values[43].tolist(), top_k=5, filter={"even": True})
+    assert all(int(m["id"]) % 2 == 0 for m in result["matches"])
+
+@pytest.mark.skipif(pinecone_emulator.hnswlib is None, reason="hnswlib is not installed")
+def test_hnsw_graph_is_updated_in_place_after_writes():
+    """Upserts and deletes patch the existing HNSW graph instead of forcing a rebuild."""
+    rng = np.random.default_rng(7)
+    count = pinecone_emulator.HNSW_MIN_VECTORS + 50
+    values = rng.normal(size=(count, 8)).astype(np.float32)
+    store = pinecone_emulator.Namespace(8)
+    store.upsert_batch([str(i) for i in range(count)], values, [{}] * count)
+    store.hnsw_search(values[0] / np.linalg.norm(values[0]), 1.0, 1)
+    graph = store._graph
+
+    # Deleting moves the last row into the freed slot; the new row lands past the old capacity
+    store.delete("5")
+    extra = rng.normal(size=(1, 8)).astype(np.float32)
+    store.upsert_batch(["new"], extra, [{}])
+    store.upsert_batch(["7"], -values[7:8], [{}])
+
+    def nearest(vector):
+        rows, _ = store.hnsw_search(vector / np.linalg.norm(vector), 1.0, 1)
+        return store.ids[rows[0]]
+
+    assert nearest(extra[0]) == "new"
+    assert nearest(values[count - 1]) == str(count - 1)
+    assert nearest(-values[7]) == "7"
+    assert nearest(values[5]) != "5"
+    assert store._graph is graph
+
+def test_include_values_returns_original_scale():
+    """Stored rows are normalized, but include_values returns the upserted values."""
+    _create_index("test-values")
+    _upsert("test-values", [{"id": "a", "values": [3, 4, 0, 0]}])
+
+    result = _query("test-values", [1, 0, 0, 0], include_values=True)
+
+    assert np.allclose(result["matches"][0]["values"], [3, 4, 0, 0])
+    assert np.isclose(result["matches"][0]["score"], 0.6)
+
+def test_filter_matches_missing_keys_and_deleted_rows():
+    """Filters see keys added by later upserts and follow rows moved by deletes."""
+    _create_index("test-columns")
+    _upsert("test-columns", [
+        {"id": "a", "values": [1, 0, 0, 0], "metadata": {"brand": "Whirlpool"}},
+        {"id": "b", "values": [0, 1, 0, 0]},
+        {"id": "c", "values": [0, 0, 1, 0], "metadata": {"brand": "Whirlpool", "in_stock": True}},
+    ])
+
+    result = _query("test-columns", [1, 1, 1, 0], top_k=10, filter={"in_stock": True})
+    assert [m["id"] for m in result["matches"]] == ["c"]
+
+    client.post("/vectors/delete", params={"index_name": "test-columns"}, json={"ids": ["a"]})
+    result = _query("test-columns", [1, 1, 1, 0], top_k=10, filter={"brand": "Whirlpool"})
+    assert [m["id"] for m in result["matches"]] == ["c"]
+
+    result = _query("test-columns", [1, 1, 1, 0], top_k=10, filter={"color": "white"})
+    assert result["matches"] == []
+
+def test_persistent_namespace_reloads_from_disk(tmp_path, monkeypatch):
+    """With a data directory, indexes survive a restart through the mapped files."""
+    monkeypatch.setattr(pinecone_emulator, "DATA_DIR", str(tmp_path))
+    _create_index("test-persist", quantization="sq8")
+    _upsert("test-persist", [
+        {"id": str(i), "values": [1, i, 0, 0], "metadata": {"i": i}} for i in range(100)
+    ], namespace="parts/v1")
+    client.post("/vectors/delete", params={"index_name": "test-persist"},
+                json={"ids": ["0"], "namespace": "parts/v1"})
+
+    # Simulate a restart by dropping the in-memory state and reloading it
+    monkeypatch.setattr(pinecone_emulator, "indexes", {})
+    monkeypatch.setattr(pinecone_emulator, "vectors", {})
+    pinecone_emulator._load_indexes()
+
+    result = _query("test-persist", [1, 3, 0, 0], namespace="parts/v1",
+                    filter={"i": 3}, include_values=True)
+    assert result["matches"][0]["id"] == "3"
+    assert np.allclose(result["matches"][0]["values"], [1, 3, 0, 0])
+    assert pinecone_emulator.vectors["test-persist"]["parts/v1"].n == 99
+
+    client.delete("/indexes/test-persist")
+    assert not (tmp_path / "test-persist").exists()
+
+def test_persistent_writes_append_to_log_and_compact(tmp_path, monkeypatch):
+    """Writes append to the change log, which is folded into the sidecar once it outgrows it."""
+    monkeypatch.setattr(pinecone_emulator, "SIDECAR_COMPACT_MIN_ENTRIES", 8)
+    path = str(tmp_path / "ns")
+    store = pinecone_emulator.Namespace(4, path=path)
+    rng = np.random.default_rng(8)
+
+    def write(i):
+        store.upsert_batch([str(i)], rng.normal(size=(1, 4)).astype(np.float32), [{"i": i}])
+        if i % 3 == 0:
+            store.delete(str(i // 2))
+        store.persist()
+
+    write(0)
+    generation = store._log_generation
+    for i in range(1, 4):
+        write(i)
+    # Small writes go to the log; the sidecar snapshot is left alone
+    assert store._log_generation == generation
+    assert len(open(store._log_path()).readlines()) == store._log_entries == 4
+
+    for i in range(4, 40):
+        write(i)
+    assert store._log_generation > generation
+    assert not os.path.exists(f"{path}.{generation}.log")
+
+    reloaded = pinecone_emulator.Namespace.load(path, 4)
+    assert reloaded.ids == store.ids
+    assert reloaded.metadata == store.metadata
+    assert np.allclose(reloaded.normalized(), store.normalized())
+
+    store.remove_files()
+    assert list(tmp_path.iterdir()) == []
+
+def test_upsert_batch_rejects_mismatched_rows_atomically():
+    """A batch with any wrongly sized vector is rejected without storing the others."""
+    _create_index("test-batch")
+    response = client.post(
+        "/vectors/upsert",
+        params={"index_name": "test-batch"},
+        json={"vectors": [
+            {"id": "a", "values": [1, 0, 0, 0]},
+            {"id": "b", "values": [1, 0, 0]},
+        ]}
+    )
+    assert response.status_code == 400
+
+    _upsert("test-batch", [
+        {"id": "a", "values": [1, 0, 0, 0]},
+        {"id": "b", "values": [0, 1, 0, 0]},
+        {"id": "a", "values": [0, 0, 1, 0]},
+    ])
+    result = _query("test-batch", [0, 0, 1, 0], top_k=5)
+    assert [m["id"] for m in result["matches"]] == ["a", "b"]
+    assert np.isclose(result["matches"][0]["score"], 1.0)
+
+def test_binary_index_rescores_with_exact_scores():
+    """Binary indexes shortlist by Hamming distance but report fp32 cosine scores."""
+    _create_index("test-binary", dimension=64, quantization="binary")
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=(200, 64)).astype(np.float32)
+    _upsert("test-binary", [{"id": str(i), "values": v.tolist()} for i, v in enumerate(values)])
+
+    query = values[11] + 0.01
+    result = _query("test-binary", query.tolist(), top_k=3)
+
+    unit = values / np.linalg.norm(values, axis=1, keepdims=True)
+    expected = unit @ (query / np.linalg.norm(query))
+    assert result["matches"][0]["id"] == "11"
+    assert np.isclose(result["matches"][0]["score"], expected[11], atol=1e-5)
+    assert [m["score"] for m in result["matches"]] == sorted((m["score"] for m in result["matches"]), reverse=True)
+
+def test_raw_binary_upsert_and_query():
+    """The binary endpoints take packed float32 bodies and return the JSON match shape."""
+    _create_index("test-raw")
+    header = json.dumps([
+        {"id": "a", "metadata": {"doc_type": "installation"}},
+        {"id": "b", "metadata": {"doc_type": "troubleshooting"}},
+    ]).encode()
+    rows = np.array([[1, 0, 0, 0], [1, 1, 0, 0]], dtype="<f4")
+    response = client.post(
+        "/vectors/upsert_raw",
+        params={"index_name": "test-raw"},
+        content=len(header).to_bytes(4, "little") + header + rows.tobytes()
+    )
+    assert response.json() == {"upserted_count": 2}
+
+    query_body = (5).to_bytes(4, "little") + np.array([0, 1, 0, 0], dtype="<f4").tobytes()
+    response = client.post("/query_raw", params={"index_name": "test-raw"}, content=query_body)
+    assert [m["id"] for m in response.json()["matches"]] == ["b", "a"]
+
+    response = client.post(
+        "/query_raw",
+        params={"index_name": "test-raw", "filter": json.dumps({"doc_type": "installation"})},
+        content=query_body
+    )
+    assert [m["id"] for m in response.json()["matches"]] == ["a"]
+
+    response = client.post("/query_raw", params={"index_name": "test-raw"}, content=query_body[:-4])
+    assert response.status_code == 400
+
+@pytest.mark.skipif(pinecone_emulator._scorer is None, reason="_scorer.so is not built")
+def test_small_dim_kernel_matches_numpy():
+    """The C kernel agrees with a NumPy dot product, including the non-SIMD tail."""
+    rng = np.random.default_rng(3)
+    for dimension in (3, 8, 45, 127):
+        matrix = rng.normal(size=(20, dimension)).astype(np.float32)
+        query = rng.normal(size=dimension).astype(np.float32)
+        assert np.allclose(pinecone_emulator._cosine_scores(matrix, query), matrix @ query, atol=1e-4)
+
+def test_sharded_scan_matches_single_pass(monkeypatch):
+    """Merging per-shard top-k results gives the same ranking as one full scan."""
+    monkeypatch.setattr(pinecone_emulator, "SCAN_BLOCK_BYTES", 1024)
+    monkeypatch.setattr(pinecone_emulator, "SCAN_WORKERS", 3)
+    monkeypatch.setattr(pinecone_emulator, "_scan_executor", pinecone_emulator.ThreadPoolExecutor(3))
+    rng = np.random.default_rng(4)
+    store = pinecone_emulator.Namespace(16)
+    store.upsert_batch([str(i) for i in range(500)], rng.normal(size=(500, 16)).astype(np.float32), [{}] * 500)
+    query = rng.normal(size=16).astype(np.float32)
+    query /= np.linalg.norm(query)
+    mask = rng.random(500) < 0.5
+
+    rows, scores = pinecone_emulator._sharded_search(store, query, 1.0, 10, mask)
+
+    expected = np.where(mask, store.normalized() @ query, -np.inf)
+    assert list(rows) == list(np.argsort(-expected)[:10])
+    assert np.allclose(scores, expected[rows], atol=1e-4)
+
+def test_searches_during_deletes_see_a_consistent_namespace():
+    """Single and batch searches racing swap-deletes never mix row counts or return deleted ids."""
+    rng = np.random.default_rng(5)
+    store = pinecone_emulator.Namespace(32)
+    count = 3000
+    ids = [str(i) for i in range(count)]
+    store.upsert_batch(ids, rng.normal(size=(count, 32)).astype(np.float32),
+                       [{"parity": i % 2} for i in range(count)])
+    query = rng.normal(size=32).astype(np.float32)
+    batch = pinecone_emulator.BatchQueryRequest(vectors=[query.tolist()] * 2, top_k=5, filter={"parity": 0})
+    deleted = set()
+    errors = []
+
+    def delete_rows():
+        for vector_id in ids[::2]:
+            store.delete(vector_id)
+            deleted.add(vector_id)
+
+    def search():
+        try:
+            while len(deleted) < count // 2:
+                before = set(deleted)
+                matches = pinecone_emulator._search(store, query, 5, {"parity": 0}, False, True)
+                matches += pinecone_emulator._search_batch(store, query[None, :].repeat(2, axis=0), batch)[0]
+                assert all(match["metadata"]["parity"] == 0 for match in matches)
+                assert not before & {match["id"] for match in matches}
+        except Exception as e:
+            errors.append(e)
+
+    searchers = [threading.Thread(target=search) for _ in range(3)]
+    for thread in searchers:
+        thread.start()
+    delete_rows()
+    for thread in searchers:
+        thread.join()
+
+    assert errors == []
+    assert store.n == count // 2
+
+def test_index_metric_controls_scores_and_ranking():
+    """Dot product and euclidean indexes rank and score by their own metric, not cosine."""
+    vectors = [
+        {"id": "short", "values": [1, 0, 0, 0]},
+        {"id": "long", "values": [3, 3, 0, 0]},
+    ]
+    _create_index("test-dot", metric="dotproduct")
+    _upsert("test-dot", vectors)
+    result = _query("test-dot", [2, 0, 0, 0])
+    assert [m["id"] for m in result["matches"]] == ["long", "short"]
+    assert np.allclose([m["score"] for m in result["matches"]], [6, 2])
+
+    _create_index("test-euclidean", metric="euclidean")
+    _upsert("test-euclidean", vectors)
+    result = _query("test-euclidean", [3, 2, 0, 0])
+    assert [m["id"] for m in result["matches"]] == ["long", "short"]
+    assert np.allclose([m["score"] for m in result["matches"]], [1, 8])
+
+def test_query_batch_matches_single_queries():
+    """Each row of a batch query returns the same matches as querying it alone."""
+    _create_index("test-batch-query", dimension=8, metric="dotproduct")
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=(40, 8)).astype(np.float32)
+    _upsert("test-batch-query", [
+        {"id": str(i), "values": v.tolist(), "metadata": {"odd": i % 2 == 1}} for i, v in enumerate(values)
+    ])
+    queries = rng.normal(size=(3, 8)).astype(np.float32).tolist()
+
+    response = client.post(
+        "/query_batch",
+        params={"index_name": "test-batch-query"},
+        json={"vectors": queries, "top_k": 4, "filter": {"odd": True}}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert len(results) == 3
+    for query_values, result in zip(queries, results):
+        single = _query("test-batch-query", query_values, top_k=4, filter={"odd": True})
+        assert [m["id"] for m in result["matches"]] == [m["id"] for m in single["matches"]]
+        assert np.allclose([m["score"] for m in result["matches"]], [m["score"] for m in single["matches"]], atol=1e-4)
+
+def test_query_endpoints_document_their_response_schema():
+    """The OpenAPI schema describes query responses, though matches are serialized as plain dicts."""
+    paths = client.get("/openapi.json").json()["paths"]
+    schema = lambda path: paths[path]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert schema("/query") == {"$ref": "#/components/schemas/QueryResponse"}
+    assert schema("/query_raw") == {"$ref": "#/components/schemas/QueryResponse"}
+    assert schema("/query_batch") == {"$ref": "#/components/schemas/BatchQueryResponse"}
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the PineconeRetriever exact-repeat and near-duplicate result caches.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the repository root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.server.modules import pinecone_retriever
+from src.server.modules.pinecone_retriever import PineconeRetriever, _SemanticResultCache
+
+# Query embeddings by normalized query; "install water filter" variants are near-duplicates
+# (cosine 0.99), "replace the water filter" is related but below the threshold (cosine 0.9)
+EMBEDDINGS = {
+    "install water filter": [1.0, 0.0, 0.0],
+    "how do i install water filter": [0.99, 0.141, 0.0],
+    "replace the water filter": [0.9, 0.436, 0.0],
+    "install ps11752778": [0.0, 1.0, 0.0],
+    "install ps11752779": [0.0, 1.0, 0.0],
+    "how to install ps11752778": [0.0, 0.99, 0.141],
+    "fix ice maker": [0.0, 0.0, 1.0],
+    "door gasket for gd5shaaxnq00": [0.6, 0.8, 0.0],
+    "door gasket for gd5shaaxnq01": [0.6, 0.8, 0.0],
+    "door gasket for my gd5shaaxnq00": [0.6, 0.79, 0.1],
+}
+
+class FakeEmbeddings:
+    """Embeddings model returning fixed vectors, counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, query):
+        self.calls += 1
+        return EMBEDDINGS[" ".join(query.lower().split())]
+
+class FakeIndex:
+    """Pinecone index returning one match per query, whose id numbers the query."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def query(self, vector, top_k, filter, namespace, include_metadata):
+        self.calls += 1
+        match = SimpleNamespace(id=f"doc{self.calls}", score=0.9, metadata={"title": "Water Filter Guide"})
+        return SimpleNamespace(matches=[match])
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def _retriever(monkeypatch, semantic=True):
+    """A retriever wired to the fake index and embeddings, with a controllable clock."""
+    monkeypatch.delenv("PINECONE_API_KEY", raising=False)
+    clock = FakeClock()
+    monkeypatch.setattr(pinecone_retriever, "time", clock)
+    retriever = PineconeRetriever(api_key=None, embeddings_model=FakeEmbeddings())
+    retriever.use_mock = False
+    retriever.index = FakeIndex()
+    if not semantic:
+        retriever._semantic_cache = None
+    return retriever, clock
+
+def _ids(retriever, query, **filters):
+    return [doc["id"] for doc in asyncio.run(retriever.retrieve(query, **filters))]
+
+def test_exact_repeat_is_served_from_cache(monkeypatch):
+    """A repeat of a query, up to case and whitespace, neither embeds nor searches again."""
+    retriever, _ = _retriever(monkeypatch)
+
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    assert _ids(retriever, "  Install   WATER filter ") == ["doc1"]
+    assert retriever.index.calls == 1
+    assert retriever.embeddings_model.calls == 1
+
+def test_cached_results_expire_after_ttl(monkeypatch):
+    """Exact and near-duplicate entries both expire after RESULT_CACHE_TTL."""
+    retriever, clock = _retriever(monkeypatch)
+
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    clock.now += pinecone_retriever.RESULT_CACHE_TTL - 1
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    clock.now += 1
+    assert _ids(retriever, "install water filter") == ["doc2"]
+    clock.now += pinecone_retriever.RESULT_CACHE_TTL
+    assert _ids(retriever, "how do i install water filter") == ["doc3"]
+
+def test_result_cache_evicts_least_recently_used(monkeypatch):
+    """Past RESULT_CACHE_SIZE entries, the least recently used query is searched again."""
+    monkeypatch.setattr(pinecone_retriever, "RESULT_CACHE_SIZE", 2)
+    retriever, _ = _retriever(monkeypatch, semantic=False)
+
+    _ids(retriever, "install water filter")
+    _ids(retriever, "fix ice maker")
+    _ids(retriever, "install water filter")
+    _ids(retriever, "install ps11752778")
+    assert retriever.index.calls == 3
+
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    assert _ids(retriever, "fix ice maker") == ["doc4"]
+
+def test_semantic_cache_reuses_only_queries_above_threshold(monkeypatch):
+    """A near-duplicate query reuses results; a merely related one searches again."""
+    retriever, _ = _retriever(monkeypatch)
+
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    assert _ids(retriever, "how do i install water filter") == ["doc1"]
+    assert _ids(retriever, "replace the water filter") == ["doc2"]
+    assert retriever.index.calls == 2
+
+def test_semantic_cache_requires_matching_filters(monkeypatch):
+    """Near-duplicates with other filters or other part numbers don't share results."""
+    retriever, _ = _retriever(monkeypatch)
+
+    assert _ids(retriever, "install water filter") == ["doc1"]
+    assert _ids(retriever, "how do i install water filter", doc_type="installation") == ["doc2"]
+    assert _ids(retriever, "how do i install water filter", top_k=5) == ["doc3"]
+
+    assert _ids(retriever, "install PS11752778") == ["doc4"]
+    assert _ids(retriever, "install PS11752779") == ["doc5"]
+    assert _ids(retriever, "how to install PS11752778") == ["doc4"]
+    assert retriever.index.calls == 5
+
+def test_semantic_cache_separates_models_without_long_digit_runs(monkeypatch):
+    """Model numbers with digits spread among letters also keep near-duplicates apart."""
+    retriever, _ = _retriever(monkeypatch)
+
+    assert _ids(retriever, "door gasket for GD5SHAAXNQ00") == ["doc1"]
+    assert _ids(retriever, "door gasket for GD5SHAAXNQ01") == ["doc2"]
+    assert _ids(retriever, "door gasket for my GD5SHAAXNQ00") == ["doc1"]
+    assert pinecone_retriever._PART_OR_MODEL_PATTERN.findall(
+        "will 67003753 or w10295370a fit my gd5shaaxnq00 kdfe104hps? 2-3 parts, 120v"
+    ) == ["67003753", "w10295370a", "gd5shaaxnq00", "kdfe104hps"]
+
+def test_returned_results_are_copies(monkeypatch):
+    """Mutating returned documents leaks into neither exact nor near-duplicate hits."""
+    retriever, _ = _retriever(monkeypatch)
+
+    first = asyncio.run(retriever.retrieve("install water filter"))
+    first[0]["title"] = "Changed"
+    first.append({"id": "extra"})
+
+    repeat = asyncio.run(retriever.retrieve("install water filter"))
+    repeat[0]["title"] = "Changed again"
+    similar = asyncio.run(retriever.retrieve("how do i install water filter"))
+
+    assert [doc["title"] for doc in repeat] == ["Changed again"]
+    assert [(doc["id"], doc["title"]) for doc in similar] == [("doc1", "Water Filter Guide")]
+    assert asyncio.run(retriever.retrieve("install water filter"))[0]["title"] == "Water Filter Guide"
+
+def test_semantic_cache_overwrites_oldest_entry_when_full():
+    """Once full, each new query replaces the oldest one in the ring buffer."""
+    cache = _SemanticResultCache(capacity=2)
+    filters = (None, None, 3, 0.7, frozenset())
+
+    cache.add([1.0, 0.0, 0.0], filters, [{"id": "a"}])
+    cache.add([0.0, 1.0, 0.0], filters, [{"id": "b"}])
+    cache.add([0.0, 0.0, 1.0], filters, [{"id": "c"}])
+
+    assert cache.lookup([1.0, 0.0, 0.0], filters) is None
+    assert cache.lookup([0.0, 2.0, 0.0], filters) == [{"id": "b"}]
+    assert cache.lookup([0.0, 0.0, 1.0], filters) == [{"id": "c"}]
+    assert cache.lookup([0.0, 0.0, 1.0], (None, None, 5, 0.7, frozenset())) is None
+    assert cache.lookup(list(np.ones(4)), filters) is None